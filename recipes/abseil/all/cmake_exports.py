@@ -0,0 +1,90 @@
+"""Tokenizer for the <Package>Targets.cmake / <Package>Exports.cmake files written by install(EXPORT).
+
+This is the reference copy. abseil and nmos-cpp ship the same module (recipes have to be self-contained),
+after changing it re-sync them with:
+
+    cp recipes/llvm-core/all/cmake_exports.py recipes/abseil/all/cmake_exports.py
+    cp recipes/llvm-core/all/cmake_exports.py recipes/nmos-cpp/all/cmake_exports.py
+
+Run it directly to benchmark the tokenizer on an export file:
+
+    python cmake_exports.py path/to/LLVMExports.cmake --repeat 20
+"""
+
+import re
+
+# One match per add_library/add_executable/set_target_properties call, arguments may span several lines
+# and contain quoted strings, which are the only place where parentheses can legitimately appear.
+_COMMAND_RE = re.compile(
+    r'^[ \t]*(add_library|add_executable|set_target_properties)[ \t]*\(([^()"]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^()"]*)*)\)',
+    re.MULTILINE)
+_ARGUMENT_RE = re.compile(r'"([^"\\]*(?:\\.[^"\\]*)*)"|([^\s"]+)')
+_ESCAPE_RE = re.compile(r"\\(.)")
+_LINK_ONLY_RE = re.compile(r"^\$<LINK_ONLY:(.+)>$")
+
+
+def _arguments(text):
+    for quoted, unquoted in _ARGUMENT_RE.findall(text):
+        if "\\" in quoted:
+            quoted = _ESCAPE_RE.sub(r"\1", quoted)
+        yield quoted or unquoted
+
+
+def parse_cmake_exports(content):
+    """Return the imported targets declared in the content of a CMake export file.
+
+    The result is a dict, in declaration order, of
+    ``{target: {"kind": "library" | "executable", "type": str, "properties": {name: [values]}}}``
+    where list properties are already split on ``;`` and CMake escapes are resolved.
+    """
+    targets = {}
+    for command, text in _COMMAND_RE.findall(content.replace("\r\n", "\n")):
+        args = list(_arguments(text))
+        if not args:
+            continue
+        target = targets.setdefault(args[0], {"kind": None, "type": None, "properties": {}})
+        if command == "add_library":
+            target["kind"] = "library"
+            target["type"] = args[1] if len(args) > 1 else None
+        elif command == "add_executable":
+            target["kind"] = "executable"
+            target["type"] = "EXECUTABLE"
+        else:
+            # set_target_properties(<target> PROPERTIES <name> <value> [<name> <value>]...)
+            properties = args[args.index("PROPERTIES") + 1:] if "PROPERTIES" in args else []
+            for name, value in zip(properties[::2], properties[1::2]):
+                target["properties"][name] = [item for item in value.split(";") if item]
+    return targets
+
+
+def load_cmake_exports(path):
+    with open(path, encoding="utf-8") as f:
+        return parse_cmake_exports(f.read())
+
+
+def split_link_only(item):
+    """Return ``(item, private)``, unwrapping ``$<LINK_ONLY:...>`` entries of INTERFACE_LINK_LIBRARIES"""
+    match = _LINK_ONLY_RE.match(item)
+    return (match.group(1), True) if match else (item, False)
+
+
+def benchmark(path, repeat):
+    import timeit
+
+    with open(path, encoding="utf-8") as f:
+        content = f.read()
+    targets = parse_cmake_exports(content)
+    links = sum(len(t["properties"].get("INTERFACE_LINK_LIBRARIES", [])) for t in targets.values())
+    best = min(timeit.repeat(lambda: parse_cmake_exports(content), number=1, repeat=repeat))
+    print(f"{path}: {len(content)} bytes, {len(targets)} targets, {links} link libraries")
+    print(f"best of {repeat}: {best * 1000:.2f} ms ({len(targets) / best:.0f} targets/s)")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the CMake export file tokenizer")
+    parser.add_argument("path", help="CMake export file, e.g. lib/cmake/llvm/LLVMExports.cmake")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    benchmark(args.path, args.repeat)
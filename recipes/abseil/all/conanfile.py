@@ -6,9 +6,9 @@ from conan.tools.cmake import CMake, CMakeToolchain, cmake_layout
 from conan.tools.files import export_conandata_patches, apply_conandata_patches, copy, get, load, replace_in_file, rmdir, save
 from conan.tools.microsoft import is_msvc
 from conan.tools.scm import Version
+from cmake_exports import load_cmake_exports
 import json
 import os
-import re
 import textwrap
 
 required_conan_version = ">=1.53.0"
@@ -32,6 +32,7 @@ class AbseilConan(ConanFile):
         "fPIC": True,
     }
     short_paths = True
+    exports = "cmake_exports.py"
 
     @property
     def _min_cppstd(self):
@@ -148,58 +149,41 @@ class AbseilConan(ConanFile):
     def _load_components_from_cmake_target_file(self, absl_target_file_path):
         components = {}
 
-        abs_target_content = load(self, absl_target_file_path)
-
-        # Replace the line endings to support building with MSys2 on Windows
-        abs_target_content = abs_target_content.replace("\r\n", "\n")
-
-        cmake_functions = re.findall(r"(?P<func>add_library|set_target_properties)[\n|\s]*\([\n|\s]*(?P<args>[^)]*)\)", abs_target_content)
-        for (cmake_function_name, cmake_function_args) in cmake_functions:
-            cmake_function_args = re.split(r"[\s|\n]+", cmake_function_args, maxsplit=2)
-
-            cmake_imported_target_name = cmake_function_args[0]
+        for cmake_imported_target_name, target in load_cmake_exports(absl_target_file_path).items():
             cmake_target_nonamespace = cmake_imported_target_name.replace("absl::", "")
             potential_lib_name = "absl_" + cmake_target_nonamespace
 
             components.setdefault(potential_lib_name, {"cmake_target": cmake_target_nonamespace})
 
-            if cmake_function_name == "add_library":
-                cmake_imported_target_type = cmake_function_args[1]
-                if cmake_imported_target_type in ["STATIC", "SHARED"]:
-                    components[potential_lib_name]["libs"] = [potential_lib_name] if cmake_target_nonamespace != "abseil_dll" else ['abseil_dll']
-            elif cmake_function_name == "set_target_properties":
-                target_properties = re.findall(r"(?P<property>INTERFACE_COMPILE_DEFINITIONS|INTERFACE_INCLUDE_DIRECTORIES|INTERFACE_LINK_LIBRARIES)[\n|\s]+(?P<values>.+)", cmake_function_args[2])
-                for target_property in target_properties:
-                    property_type = target_property[0]
-                    if property_type == "INTERFACE_LINK_LIBRARIES":
-                        values_list = target_property[1].replace('"', "").split(";")
-                        for dependency in values_list:
-                            if dependency.startswith("absl::"): # abseil targets
-                                components[potential_lib_name].setdefault("requires", []).append(dependency.replace("absl::", "absl_"))
-                            else: # system libs or frameworks
-                                if self.settings.os in ["Linux", "FreeBSD"]:
-                                    if dependency == "Threads::Threads":
-                                        components[potential_lib_name].setdefault("system_libs", []).append("pthread")
-                                    elif "-lm" in dependency:
-                                        components[potential_lib_name].setdefault("system_libs", []).append("m")
-                                    elif "-lrt" in dependency:
-                                        components[potential_lib_name].setdefault("system_libs", []).append("rt")
-                                elif self.settings.os == "Windows":
-                                    for system_lib in ["bcrypt", "advapi32", "dbghelp"]:
-                                        if system_lib in dependency:
-                                            components[potential_lib_name].setdefault("system_libs", []).append(system_lib)
-                                elif is_apple_os(self):
-                                    for framework in ["CoreFoundation"]:
-                                        if framework in dependency:
-                                            components[potential_lib_name].setdefault("frameworks", []).append(framework)
-                    elif property_type == "INTERFACE_COMPILE_DEFINITIONS":
-                        values_list = target_property[1].replace('"', "").split(";")
-                        for definition in values_list:
-                            if definition == r"\$<\$<PLATFORM_ID:AIX>:_LINUX_SOURCE_COMPAT>":
-                                if self.settings.os == "AIX":
-                                    components[potential_lib_name].setdefault("defines", []).append("_LINUX_SOURCE_COMPAT")
-                            else:
-                                components[potential_lib_name].setdefault("defines", []).append(definition)
+            if target["type"] in ["STATIC", "SHARED"]:
+                components[potential_lib_name]["libs"] = [potential_lib_name] if cmake_target_nonamespace != "abseil_dll" else ['abseil_dll']
+
+            for dependency in target["properties"].get("INTERFACE_LINK_LIBRARIES", []):
+                if dependency.startswith("absl::"): # abseil targets
+                    components[potential_lib_name].setdefault("requires", []).append(dependency.replace("absl::", "absl_"))
+                else: # system libs or frameworks
+                    if self.settings.os in ["Linux", "FreeBSD"]:
+                        if dependency == "Threads::Threads":
+                            components[potential_lib_name].setdefault("system_libs", []).append("pthread")
+                        elif "-lm" in dependency:
+                            components[potential_lib_name].setdefault("system_libs", []).append("m")
+                        elif "-lrt" in dependency:
+                            components[potential_lib_name].setdefault("system_libs", []).append("rt")
+                    elif self.settings.os == "Windows":
+                        for system_lib in ["bcrypt", "advapi32", "dbghelp"]:
+                            if system_lib in dependency:
+                                components[potential_lib_name].setdefault("system_libs", []).append(system_lib)
+                    elif is_apple_os(self):
+                        for framework in ["CoreFoundation"]:
+                            if framework in dependency:
+                                components[potential_lib_name].setdefault("frameworks", []).append(framework)
+
+            for definition in target["properties"].get("INTERFACE_COMPILE_DEFINITIONS", []):
+                if definition == "$<$<PLATFORM_ID:AIX>:_LINUX_SOURCE_COMPAT>":
+                    if self.settings.os == "AIX":
+                        components[potential_lib_name].setdefault("defines", []).append("_LINUX_SOURCE_COMPAT")
+                else:
+                    components[potential_lib_name].setdefault("defines", []).append(definition)
 
         return components
 
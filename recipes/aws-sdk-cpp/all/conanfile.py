@@ -10,6 +10,9 @@ from conan.tools.scm import Version
 
 required_conan_version = ">=1.54.0"
 
+# Per-process index of the sdks table: {version: frozenset(sdk names)}
+_SDKS_BY_VERSION = {}
+
 
 class AwsSdkCppConan(ConanFile):
     name = "aws-sdk-cpp"
@@ -428,6 +431,9 @@ class AwsSdkCppConan(ConanFile):
             "shared": [True, False],
             "fPIC": [True, False],
             "min_size": [True, False],
+            "unity_build": [True, False],
+            "unity_build_batch_size": [None, "ANY"],
+            "link_jobs": [None, "ANY"],
         },
         **{sdk_name: [None, True, False] for sdk_name, _ in _sdks},
     }
@@ -435,7 +441,10 @@ class AwsSdkCppConan(ConanFile):
         **{
             "shared": False,
             "fPIC": True,
-            "min_size": False
+            "min_size": False,
+            "unity_build": True,
+            "unity_build_batch_size": None,
+            "link_jobs": None,
         },
         **{sdk_name: None for sdk_name, _ in _sdks},
         # Overrides
@@ -456,6 +465,16 @@ class AwsSdkCppConan(ConanFile):
             "transfer": ["s3"],
         }
 
+    @property
+    def _version_sdks(self):
+        if not _SDKS_BY_VERSION:
+            for sdk_name, sdk_versions in self._sdks:
+                for version in sdk_versions:
+                    _SDKS_BY_VERSION.setdefault(version, set()).add(sdk_name)
+            for version in _SDKS_BY_VERSION:
+                _SDKS_BY_VERSION[version] = frozenset(_SDKS_BY_VERSION[version])
+        return _SDKS_BY_VERSION.get(str(self.version), frozenset())
+
     def export_sources(self):
         export_conandata_patches(self)
 
@@ -468,14 +487,18 @@ class AwsSdkCppConan(ConanFile):
             setattr(self.options, module, True)
 
         # Remove all sdk options not belonging to the current version
-        for sdk_name, sdk_versions in self._sdks:
-            if self.version not in sdk_versions:
+        version_sdks = self._version_sdks
+        for sdk_name, _ in self._sdks:
+            if sdk_name not in version_sdks:
                 self.options.rm_safe(sdk_name)
 
     def configure(self):
         if self.options.shared:
             self.options.rm_safe("fPIC")
 
+        if not self.options.unity_build:
+            self.options.rm_safe("unity_build_batch_size")
+
         # If the user does not specify a value for a specific sdk:
         # - Set it to True if it's a dependency of a main module that is set to True
         for module, dependencies in self._internal_requirements.items():
@@ -489,10 +512,10 @@ class AwsSdkCppConan(ConanFile):
         # - Otherwise set it to False
         # This way there are no None options past this method, and we can control default values
         # of the dependencies of the main modules but still give the user control over them
-        for sdk_name, sdk_versions in self._sdks:
+        for sdk_name in self._version_sdks:
             # == None is true for both "was deleted" and "was not set by the user",
             # ensure we only try to set the value to false for the latter
-            if self.version in sdk_versions and self.options.get_safe(sdk_name) == None:
+            if self.options.get_safe(sdk_name) == None:
                 setattr(self.options, sdk_name, False)
 
     def layout(self):
@@ -577,12 +600,24 @@ class AwsSdkCppConan(ConanFile):
                     if not self.options.get_safe(internal_requirement):
                         raise ConanInvalidConfiguration(f"-o={self.ref}:{main_module}=True requires -o={self.ref}:{internal_requirement}=True")
 
+        for option in ["unity_build_batch_size", "link_jobs"]:
+            value = self.options.get_safe(option)
+            if value != None and (not str(value).isdigit() or int(str(value)) < 1):
+                raise ConanInvalidConfiguration(f"{self.ref} option {option} must be a positive integer")
+
+    def package_id(self):
+        # build strategy only, it doesn't change the binaries
+        del self.info.options.unity_build
+        self.info.options.rm_safe("unity_build_batch_size")
+        del self.info.options.link_jobs
+
     def source(self):
         get(self, **self.conan_data["sources"][self.version], strip_root=True)
 
     def _enabled_sdks(self):
+        version_sdks = self._version_sdks
         for sdk in self._sdks:
-            if self.options.get_safe(sdk[0]):
+            if sdk[0] in version_sdks and self.options.get_safe(sdk[0]):
                 yield sdk
 
     def generate(self):
@@ -595,7 +630,21 @@ class AwsSdkCppConan(ConanFile):
             build_only.append(sdk_name)
         tc.cache_variables["BUILD_ONLY"] = ";".join(build_only)
 
-        tc.cache_variables["ENABLE_UNITY_BUILD"] = True
+        # ENABLE_UNITY_BUILD compiles each sdk as a single translation unit, which for large sdks
+        # gives huge objects; CMake unity builds with a batch size split them in several ones
+        unity_build_batch_size = self.options.get_safe("unity_build_batch_size")
+        if unity_build_batch_size:
+            tc.cache_variables["ENABLE_UNITY_BUILD"] = False
+            tc.cache_variables["CMAKE_UNITY_BUILD"] = True
+            tc.cache_variables["CMAKE_UNITY_BUILD_BATCH_SIZE"] = str(unity_build_batch_size)
+        else:
+            tc.cache_variables["ENABLE_UNITY_BUILD"] = bool(self.options.unity_build)
+        if self.options.link_jobs:
+            # Only honored by Ninja generators: limits the number of sdks linked concurrently
+            if "Ninja" not in str(self.conf.get("tools.cmake.cmaketoolchain:generator", default="")):
+                self.output.warning(f"{self.ref} option link_jobs is ignored unless tools.cmake.cmaketoolchain:generator is a Ninja generator")
+            tc.cache_variables["CMAKE_JOB_POOLS"] = f"aws_sdk_link={self.options.link_jobs}"
+            tc.cache_variables["CMAKE_JOB_POOL_LINK"] = "aws_sdk_link"
         tc.cache_variables["ENABLE_TESTING"] = False
         tc.cache_variables["AUTORUN_UNIT_TESTS"] = False
         tc.cache_variables["BUILD_DEPS"] = False
@@ -12,8 +12,10 @@ from conan.tools.layout import basic_layout
 from conan.tools.microsoft import is_msvc, is_msvc_static_runtime, MSBuildToolchain, msvc_runtime_flag, VCVars
 from conan.tools.scm import Version
 
+from concurrent.futures import ThreadPoolExecutor
 import glob
 from io import StringIO
+import json
 import os
 import re
 import shlex
@@ -23,6 +25,28 @@ import yaml
 
 required_conan_version = ">=1.53.0"
 
+# Parsed dependencies-x.y.z files, shared by all BoostConan instances of this process
+_DEPENDENCIES_CACHE = {}
+
+# Transitive closures computed for dependencies files without a `closure` section, keyed by file path
+_DEPENDENCIES_CLOSURE_CACHE = {}
+
+# Results of the python interpreter probe, keyed by interpreter path and modification time
+_PYTHON_PROBE_CACHE = {}
+
+# sysconfig variables needed to locate the python headers and library
+_PYTHON_PROBE_VARS = (
+    "INCLUDEDIR",
+    "INCLUDEPY",
+    "LDLIBRARY",
+    "LIBDEST",
+    "LIBDIR",
+    "LIBRARY",
+    "MULTIARCH",
+    "WITH_DYLD",
+    "multiarchsubdir",
+)
+
 # When adding (or removing) an option, also add this option to the list in
 # `rebuild-dependencies.yml` and re-run that script.
 CONFIGURE_OPTIONS = (
@@ -90,6 +114,7 @@ class BoostConan(ConanFile):
         "python_version": [None, "ANY"],  # major.minor; computed automatically, if None
         "namespace": ["ANY"],  # custom boost namespace for bcp, e.g. myboost
         "namespace_alias": [True, False],  # enable namespace alias for bcp, boost=myboost
+        "bcp_jobs": [None, "ANY"],  # number of concurrent bcp workers for a custom namespace
         "multithreading": [True, False],  # enables multithreading support
         "numa": [True, False],
         "zlib": [True, False],
@@ -129,6 +154,7 @@ class BoostConan(ConanFile):
         "python_version": None,
         "namespace": "boost",
         "namespace_alias": False,
+        "bcp_jobs": None,
         "multithreading": True,
         "numa": True,
         "zlib": True,
@@ -158,6 +184,7 @@ class BoostConan(ConanFile):
 
     def export(self):
         copy(self, f"dependencies/{self._dependency_filename}", src=self.recipe_folder, dst=self.export_folder)
+        copy(self, f"dependencies/{self._dependency_json_filename}", src=self.recipe_folder, dst=self.export_folder)
 
     def export_sources(self):
         export_conandata_patches(self)
@@ -332,41 +359,72 @@ class BoostConan(ConanFile):
     def _dependency_filename(self):
         return f"dependencies-{self.version}.yml"
 
+    @property
+    def _dependency_json_filename(self):
+        return f"dependencies-{self.version}.json"
+
+    @property
+    def _dependencies_filepath(self):
+        # The json file is generated by `rebuild-dependencies.py` next to the yml file, and is much faster to load
+        dependencies_dir = os.path.join(self.recipe_folder, "dependencies")
+        json_filepath = os.path.join(dependencies_dir, self._dependency_json_filename)
+        yaml_filepath = os.path.join(dependencies_dir, self._dependency_filename)
+        return json_filepath if os.path.isfile(json_filepath) else yaml_filepath
+
     @property
     def _dependencies(self):
         if self._cached_dependencies is None:
-            dependencies_filepath = os.path.join(self.recipe_folder, "dependencies", self._dependency_filename)
-            if not os.path.isfile(dependencies_filepath):
-                raise ConanException(f"Cannot find {dependencies_filepath}")
-            with open(dependencies_filepath, encoding='utf-8') as f:
-                self._cached_dependencies = yaml.safe_load(f)
+            dependencies_filepath = self._dependencies_filepath
+            if dependencies_filepath not in _DEPENDENCIES_CACHE:
+                if not os.path.isfile(dependencies_filepath):
+                    raise ConanException(f"Cannot find {dependencies_filepath}")
+                with open(dependencies_filepath, encoding='utf-8') as f:
+                    if dependencies_filepath.endswith(".json"):
+                        _DEPENDENCIES_CACHE[dependencies_filepath] = json.load(f)
+                    else:
+                        _DEPENDENCIES_CACHE[dependencies_filepath] = yaml.safe_load(f)
+            self._cached_dependencies = _DEPENDENCIES_CACHE[dependencies_filepath]
         return self._cached_dependencies
 
+    @property
+    def _dependencies_closure(self):
+        """
+        Transitive closure of the module dependency graph, generated by `rebuild-dependencies.py`.
+        Fall back to computing it once when the dependencies file has no `closure` section.
+        """
+        closure = self._dependencies.get("closure")
+        if closure is not None:
+            return closure
+        # The parsed file is shared by all instances, keep it untouched
+        dependencies_filepath = self._dependencies_filepath
+        closure = _DEPENDENCIES_CLOSURE_CACHE.get(dependencies_filepath)
+        if closure is None:
+            tree = self._dependencies["dependencies"]
+            dependencies = {}
+
+            def visit(module):
+                if module not in dependencies:
+                    dependencies[module] = set()
+                    for dep in tree[module]:
+                        dependencies[module].add(dep)
+                        dependencies[module].update(visit(dep))
+                return dependencies[module]
+
+            for module in tree:
+                visit(module)
+            super_modules = {module: set() for module in tree}
+            for module, deps in dependencies.items():
+                for dep in deps:
+                    super_modules[dep].add(module)
+            closure = {"dependencies": dependencies, "super_modules": super_modules}
+            _DEPENDENCIES_CLOSURE_CACHE[dependencies_filepath] = closure
+        return closure
+
     def _all_dependent_modules(self, name):
-        dependencies = {name}
-        while True:
-            new_dependencies = set()
-            for dependency in dependencies:
-                new_dependencies.update(set(self._dependencies["dependencies"][dependency]))
-                new_dependencies.update(dependencies)
-            if len(new_dependencies) > len(dependencies):
-                dependencies = new_dependencies
-            else:
-                break
-        return dependencies
+        return {name}.union(self._dependencies_closure["dependencies"][name])
 
     def _all_super_modules(self, name):
-        dependencies = {name}
-        while True:
-            new_dependencies = set(dependencies)
-            for module in self._dependencies["dependencies"]:
-                if dependencies.intersection(set(self._dependencies["dependencies"][module])):
-                    new_dependencies.add(module)
-            if len(new_dependencies) > len(dependencies):
-                dependencies = new_dependencies
-            else:
-                break
-        return dependencies
+        return {name}.union(self._dependencies_closure["super_modules"].get(name, ()))
 
     @property
     def _bcp_dir(self):
@@ -665,6 +723,9 @@ class BoostConan(ConanFile):
         if self.options.without_fiber:
             self.options.rm_safe("numa")
 
+        if self.options.header_only or self.options.namespace == "boost":
+            self.options.rm_safe("bcp_jobs")
+
         # Use verbosity from [conf] if specified
         verbosity = self.conf.get("tools.build:verbosity", default="quiet")
         if verbosity == "verbose" and int(self.options.debug_level) < 2:
@@ -725,6 +786,10 @@ class BoostConan(ConanFile):
         if is_msvc(self) and self._shared and is_msvc_static_runtime(self):
             raise ConanInvalidConfiguration("Boost can not be built as shared library with MT runtime.")
 
+        bcp_jobs = self.options.get_safe("bcp_jobs")
+        if bcp_jobs and (not str(bcp_jobs).isdigit() or int(str(bcp_jobs)) < 1):
+            raise ConanInvalidConfiguration(f"{self.ref}:bcp_jobs must be a positive integer, got '{bcp_jobs}'")
+
         # FIXME: In 1.84.0, there are compilation errors on msvc shared build for boost.fiber. https://github.com/boostorg/fiber/issues/314
         if Version(self.version) >= "1.84.0" and is_msvc(self) and self._shared and not self.options.without_fiber:
             raise ConanInvalidConfiguration("Boost.fiber can not be built as shared library on MSVC.")
@@ -835,6 +900,7 @@ class BoostConan(ConanFile):
             del self.info.options.debug_level
             del self.info.options.filesystem_version
             del self.info.options.pch
+            self.info.options.rm_safe("bcp_jobs")  # the copied sources don't depend on the number of bcp workers
             del self.info.options.python_executable  # PATH to the interpreter is not important, only version matters
             if self.info.options.without_python:
                 del self.info.options.python_version
@@ -878,17 +944,50 @@ class BoostConan(ConanFile):
         output = output.strip()
         return output if output != "None" else None
 
+    @property
+    def _python_probe(self):
+        """
+        obtain everything needed from the python interpreter by running it only once
+        the result is cached per interpreter path and modification time
+        :return: dict with the version, abiflags, python_inc, sysconfig paths and variables of the python interpreter
+        """
+        python_executable = self._python_executable
+        python_path = python_executable if os.path.isfile(python_executable) else shutil.which(python_executable)
+        cache_key = (python_executable, os.path.getmtime(python_path) if python_path else None)
+        if cache_key not in _PYTHON_PROBE_CACHE:
+            # https://docs.python.org/3/library/sysconfig.html
+            # https://docs.python.org/2.7/library/sysconfig.html
+            # NOTE: distutils is deprecated and breaks the recipe since Python 3.10,
+            # and may be missing before that (e.g. Debian without python3-distutils): only its fallback values are lost then
+            output = self._run_python_script("from __future__ import print_function; "
+                                             "import json, sys, sysconfig; "
+                                             "du = None; "
+                                             "exec('try: import distutils.sysconfig as du\\nexcept ImportError: pass') if sys.version_info < (3, 10) else None; "
+                                             "s = lambda v: None if v is None else str(v); "
+                                             f"names = {list(_PYTHON_PROBE_VARS)!r}; "
+                                             "print(json.dumps({"
+                                             "'version': '{}.{}'.format(sys.version_info[0], sys.version_info[1]), "
+                                             "'abiflags': getattr(sys, 'abiflags', ''), "
+                                             "'python_inc': s(getattr(sysconfig, 'get_python_inc', lambda: None)()), "
+                                             "'paths': dict((n, s(sysconfig.get_path(n))) for n in ['include', 'platinclude']), "
+                                             "'sc_vars': dict((n, s(sysconfig.get_config_var(n))) for n in names), "
+                                             "'du_vars': dict((n, s(du.get_config_var(n))) for n in names) if du else {}"
+                                             "}))")
+            try:
+                probe = json.loads(output)
+            except (TypeError, ValueError):
+                self.output.warning(f"could not probe python interpreter {python_executable}")
+                probe = {}
+            _PYTHON_PROBE_CACHE[cache_key] = probe
+        return _PYTHON_PROBE_CACHE[cache_key]
+
     def _get_python_path(self, name):
         """
         obtain path entry for the python installation
-        :param name: name of the python config entry for path to be queried (such as "include", "platinclude", etc.)
+        :param name: name of the python config entry for path to be queried ("include" or "platinclude")
         :return: path entry from the sysconfig
         """
-        # https://docs.python.org/3/library/sysconfig.html
-        # https://docs.python.org/2.7/library/sysconfig.html
-        return self._run_python_script("from __future__ import print_function; "
-                                       "import sysconfig; "
-                                       f"print(sysconfig.get_path('{name}'))")
+        return self._python_probe.get("paths", {}).get(name)
 
     def _get_python_sc_var(self, name):
         """
@@ -896,9 +995,7 @@ class BoostConan(ConanFile):
         :param name: name of variable to be queried (such as LIBRARY or LDLIBRARY)
         :return: value of python sysconfig variable
         """
-        return self._run_python_script("from __future__ import print_function; "
-                                       "import sysconfig; "
-                                       f"print(sysconfig.get_config_var('{name}'))")
+        return self._python_probe.get("sc_vars", {}).get(name)
 
     def _get_python_du_var(self, name):
         """
@@ -907,24 +1004,14 @@ class BoostConan(ConanFile):
         :param name: name of variable to be queried (such as LIBRARY or LDLIBRARY)
         :return: value of python sysconfig variable
         """
-        return self._run_python_script("from __future__ import print_function; "
-                                       "import distutils.sysconfig as du_sysconfig; "
-                                       f"print(du_sysconfig.get_config_var('{name}'))")
+        return self._python_probe.get("du_vars", {}).get(name)
 
     def _get_python_var(self, name):
         """
         obtain value of python variable, either by sysconfig, or by distutils.sysconfig
         :param name: name of variable to be queried (such as LIBRARY or LDLIBRARY)
         :return: value of python sysconfig variable
-
-        NOTE: distutils is deprecated and breaks the recipe since Python 3.10
         """
-        python_version_parts = str(self.info.options.python_version).split('.')
-        python_major = int(python_version_parts[0])
-        python_minor = int(python_version_parts[1])
-        if(python_major >= 3 and python_minor >= 10):
-            return self._get_python_sc_var(name)
-
         return self._get_python_sc_var(name) or self._get_python_du_var(name)
 
     def _detect_python_version(self):
@@ -932,9 +1019,7 @@ class BoostConan(ConanFile):
         obtain version of python interpreter
         :return: python interpreter version, in format major.minor
         """
-        return self._run_python_script("from __future__ import print_function; "
-                                       "import sys; "
-                                       "print('{}.{}'.format(sys.version_info[0], sys.version_info[1]))")
+        return self._python_probe.get("version")
 
     @property
     def _python_version(self):
@@ -949,9 +1034,7 @@ class BoostConan(ConanFile):
         obtain the result of the "sysconfig.get_python_inc()" call
         :return: result of the "sysconfig.get_python_inc()" execution
         """
-        return self._run_python_script("from __future__ import print_function; "
-                                       "import sysconfig; "
-                                       "print(sysconfig.get_python_inc())")
+        return self._python_probe.get("python_inc")
 
     @property
     def _python_abiflags(self):
@@ -959,9 +1042,7 @@ class BoostConan(ConanFile):
         obtain python ABI flags, see https://www.python.org/dev/peps/pep-3149/ for the details
         :return: the value of python ABI flags
         """
-        return self._run_python_script("from __future__ import print_function; "
-                                       "import sys; "
-                                       "print(getattr(sys, 'abiflags', ''))")
+        return self._python_probe.get("abiflags")
 
     @property
     def _python_includes(self):
@@ -1090,10 +1171,40 @@ class BoostConan(ConanFile):
             for d in os.listdir(os.path.join(self.source_folder, "libs")):
                 if os.path.isdir(os.path.join(self.source_folder, "libs", d)):
                     libraries.add(d)
-            libraries = " ".join(libraries)
-            command = f"{self._bcp_exe} {namespace} {alias} {boostdir} {libraries} {self._bcp_dir}"
-            self.output.warning(command)
-            self.run(command)
+
+            jobs = min(int(str(self.options.get_safe("bcp_jobs") or 1)), len(libraries))
+            if jobs <= 1:
+                libraries = " ".join(libraries)
+                command = f"{self._bcp_exe} {namespace} {alias} {boostdir} {libraries} {self._bcp_dir}"
+                self.output.warning(command)
+                self.run(command)
+                return
+
+            # Every worker copies its share of the libraries (and all their dependencies) into its own folder,
+            # so workers never write the same file concurrently. The folders are merged afterwards.
+            partitions = [sorted(libraries)[i::jobs] for i in range(jobs)]
+            worker_dirs = [f"{self._bcp_dir}.{i}" for i in range(jobs)]
+
+            def run_bcp_worker(partition, worker_dir):
+                rmdir(self, worker_dir)
+                mkdir(self, worker_dir)
+                command = f"{self._bcp_exe} {namespace} {alias} {boostdir} {' '.join(partition)} {worker_dir}"
+                self.output.warning(command)
+                self.run(command)
+
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                for future in [executor.submit(run_bcp_worker, p, d) for p, d in zip(partitions, worker_dirs)]:
+                    future.result()
+
+            for worker_dir in worker_dirs:
+                for root, _, files in os.walk(worker_dir):
+                    dst_root = os.path.join(self._bcp_dir, os.path.relpath(root, worker_dir))
+                    os.makedirs(dst_root, exist_ok=True)
+                    for f in files:
+                        dst = os.path.join(dst_root, f)
+                        if not os.path.exists(dst):
+                            os.replace(os.path.join(root, f), dst)
+                rmdir(self, worker_dir)
 
     def build(self):
         stacktrace_jamfile = os.path.join(self.source_folder, "libs", "stacktrace", "build", "Jamfile.v2")
@@ -1,15 +1,18 @@
 #!/usr/bin/env python3
 
 import argparse
+import concurrent.futures
 import dataclasses
+import hashlib
 import json
 import logging
 import pprint
 import re
 import subprocess
 import tempfile
+import time
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 import yaml
 from conan.tools.files import chdir
@@ -97,6 +100,9 @@ class BoostDependenciesExport(object):
     libs: Dict[str, List[str]] = dataclasses.field(default_factory=dict)
     requirements: Dict[str, List[str]] = dataclasses.field(default_factory=dict)
     static_only: List[str] = dataclasses.field(default_factory=list)
+    commit: str = ""
+    generator: str = ""
+    closure: Dict[str, Dict[str, List[str]]] = dataclasses.field(default_factory=dict)
 
 
 @dataclasses.dataclass
@@ -105,20 +111,135 @@ class BoostDependencies(object):
     export: BoostDependenciesExport
 
 
+@dataclasses.dataclass
+class JamfileInfo(object):
+    using: List[str]
+    libs: List[str]
+    boost_libs: Set[str]
+
+
+class JamfileScanner(object):
+    """
+    Extract the requirements (`using` and `lib` statements) and the provided boost libraries of boost modules
+    from their Jamfile. Every Jamfile is read only once, with precompiled patterns.
+    """
+    _USING_RE = re.compile(r"\n(.*)using\s+([^ ;:]+)\s*", re.MULTILINE)
+    _LIB_RE = re.compile(r"\n(.*)\s(?:searched-)?lib\s+([^ \t\n;:]+)", re.MULTILINE)
+    _BOOST_LIB_RE = re.compile(r"[ \n](boost-)?lib ([a-zA-Z0-9_]+)[ \n]")
+
+    # If text before main capture group contains a string or a comment => ignore
+    _IGNORE_PREFIX_RE = re.compile(r"[#\"]")
+    _IGNORE_PARTS_RE = re.compile(r"boost|[<>]")
+
+    # Modules can ship both files: requirements are read from the first one of `Jamfile.v2`, `Jamfile`,
+    # the provided boost libraries from the first one of `Jamfile`, `Jamfile.v2`.
+    _REQUIREMENTS_JAMFILES = ("Jamfile.v2", "Jamfile")
+    _BOOST_LIBS_JAMFILES = ("Jamfile", "Jamfile.v2")
+
+    def __init__(self, libs_path: Path):
+        self.libs_path = libs_path
+        self._cache: Dict[str, Optional[JamfileInfo]] = {}
+
+    def jamfile(self, module: str, jam_names: Tuple[str, ...] = _REQUIREMENTS_JAMFILES) -> Optional[Path]:
+        for jam_name in jam_names:
+            jam = self.libs_path / module / "build" / jam_name
+            if jam.is_file():
+                return jam
+        return None
+
+    def scan(self, module: str) -> Optional[JamfileInfo]:
+        """Return the scan results of the Jamfiles of a module, or None when the module has no Jamfile"""
+        if module not in self._cache:
+            requirements_jam = self.jamfile(module, self._REQUIREMENTS_JAMFILES)
+            if requirements_jam is None:
+                self._cache[module] = None
+            else:
+                info = self.scan_text(requirements_jam.read_text())
+                boost_libs_jam = self.jamfile(module, self._BOOST_LIBS_JAMFILES)
+                if boost_libs_jam != requirements_jam:
+                    info.boost_libs = self.scan_text(boost_libs_jam.read_text()).boost_libs
+                self._cache[module] = info
+        return self._cache[module]
+
+    @classmethod
+    def _grep_libs(cls, regex: re.Pattern, text: str) -> List[str]:
+        res = set()
+        for m in regex.finditer(text):
+            if cls._IGNORE_PREFIX_RE.search(m.group(1)):
+                continue
+            l = m.group(2).lower()
+            if cls._IGNORE_PARTS_RE.search(l):
+                continue
+            res.add(l)
+        return list(res)
+
+    @classmethod
+    def scan_text(cls, text: str) -> JamfileInfo:
+        boost_libs = set()
+        for m in cls._BOOST_LIB_RE.finditer(text):
+            lib = f"boost_{m.group(2)}" if m.group(1) else m.group(2)
+            if lib.startswith("boost_"):
+                boost_libs.add(lib[len("boost_"):])
+        return JamfileInfo(
+            using=cls._grep_libs(cls._USING_RE, text),
+            libs=cls._grep_libs(cls._LIB_RE, text),
+            boost_libs=boost_libs,
+        )
+
+
 class BoostDependencyBuilder(object):
-    def __init__(self, boost_version: str, boostdep_version: str, tmppath: Path, git_url: str, outputdir: Path, unsafe: bool):
+    def __init__(self, boost_version: str, boostdep_version: str, tmppath: Path, git_url: str, outputdir: Path, unsafe: bool, worktree: bool = False):
         self.boost_version = boost_version
         self.boostdep_version = boostdep_version
         self.git_url = git_url
         self.tmppath = tmppath
         self.outputdir = outputdir
         self.unsafe = unsafe
+        self.worktree = worktree
         self._boostdep = None
+        self._commit = None
+        self._jamfile_scanner = JamfileScanner(self.source_path / "libs")
 
     @property
     def boost_path(self) -> Path:
         return self.tmppath / "boost"
 
+    @property
+    def worktree_path(self) -> Path:
+        return self.tmppath / f"boost-{self.boost_version}"
+
+    @property
+    def source_path(self) -> Path:
+        """Checkout of the boost sources of this version that is scanned for dependencies"""
+        return self.worktree_path if self.worktree else self.boost_path
+
+    @property
+    def commit(self) -> str:
+        """Commit hash of the boost-x.y.z tag"""
+        if self._commit is None:
+            with chdir(self, self.boost_path):
+                self._commit = subprocess.check_output(["git", "rev-parse", f"boost-{self.boost_version}^{{commit}}"], text=True).strip()
+        return self._commit
+
+    @property
+    def generator(self) -> str:
+        """Hash of the inputs of this script that change its output for a given boost commit:
+        the configure options, the boostdep version and the script itself"""
+        h = hashlib.sha256()
+        h.update(json.dumps(CONFIGURE_OPTIONS).encode())
+        h.update(self.boostdep_version.encode())
+        h.update(Path(__file__).read_bytes())
+        return h.hexdigest()
+
+    def is_up_to_date(self) -> bool:
+        """Return true when the dependency files were generated from the current commit of the boost-x.y.z tag,
+        by this same script with the same configure options and boostdep version"""
+        if not self._outputpath.is_file() or not self._json_outputpath.is_file():
+            return False
+        with self._json_outputpath.open() as fin:
+            data = json.load(fin)
+        return data.get("commit") == self.commit and data.get("generator") == self.generator and "UNSAFE" not in data
+
     def do_git_update(self) -> None:
         if not self.boost_path.exists():
             with chdir(self, self.tmppath):
@@ -158,51 +279,55 @@ class BoostDependencyBuilder(object):
             print("Removing unknown files/directories")
             subprocess.check_call(["git", "clean", "-d", "-f"])
 
+    def do_git_submodule_fetch(self):
+        """Initialize the submodules of the main clone, so the worktrees can borrow their objects"""
+        with chdir(self, self.boost_path):
+            print("Fetching git submodules")
+            subprocess.check_call(["git", "submodule", "update", "--init"])
+
+    def do_git_worktree_update(self):
+        """
+        Check out this version in its own git worktree, next to the main boost clone.
+        The worktree shares the object store of the main clone, and its submodules borrow the objects of
+        the submodules of the main clone, so multiple versions can be checked out (and scanned) at the same time.
+        """
+        if not self.worktree_path.exists():
+            with chdir(self, self.boost_path):
+                print(f"Adding worktree for version {self.boost_version}")
+                subprocess.check_call(["git", "worktree", "prune"])
+                subprocess.check_call(["git", "worktree", "add", "--detach", "--", str(self.worktree_path), f"boost-{self.boost_version}"])
+        with chdir(self, self.worktree_path):
+            if not self.unsafe:
+                # De-init + init to make sure that boostdep won't detect a new or removed boost library
+                subprocess.check_call(["git", "submodule", "deinit", "--all", "-f"])
+            subprocess.check_call(["git", "checkout", "--detach", f"boost-{self.boost_version}"])
+
+            submodules = subprocess.check_output(["git", "config", "-f", ".gitmodules", "--get-regexp", r"^submodule\..*\.path$"], text=True)
+            for line in submodules.splitlines():
+                key, path = line.split(maxsplit=1)
+                name = key[len("submodule."):-len(".path")]
+                cmd = ["git", "submodule", "update", "--init"]
+                reference = self.boost_path / ".git" / "modules" / name
+                if reference.is_dir():
+                    cmd += ["--reference", str(reference)]
+                subprocess.check_call(cmd + ["--", path])
+
+            subprocess.check_call(["git", "clean", "-d", "-f"])
+
     def do_install_boostdep(self):
         with chdir(self, self.boost_path):
             print(f"Installing boostdep/{self.boostdep_version}")
             cmd = ["conan", "install", "--tool-requires", f"boostdep/{self.boostdep_version}", "--format", "json", "-vquiet"]
             info = json.loads(subprocess.check_output(cmd))
             self._boostdep = Path(info["graph"]["nodes"]["1"]["package_folder"]) / "bin" / "boostdep"
-
-    _GREP_IGNORE_PREFIX = ("#", "\"")
-    _GREP_IGNORE_PARTS = ("boost", "<", ">")
-
-    @classmethod
-    def _grep_libs(cls, regex, text):
-        res = set()
-        for m in re.finditer(regex, text, flags=re.MULTILINE):
-            # If text before main capture group contains a string or a comment => ignore
-            ignore = False
-            for ign in cls._GREP_IGNORE_PREFIX:
-                if ign in m.group(1):
-                    ignore = True
-            if ignore:
-                continue
-            l = m.group(2).lower()
-            ignore = False
-            for ign in cls._GREP_IGNORE_PARTS:
-                if ign in l:
-                    ignore = True
-            if ignore:
-                continue
-            res.add(l)
-        return list(res)
+        return self._boostdep
 
     def _grep_requirements(self, component: str) -> List[str]:
-        jam = self.boost_path / "libs" / component / "build" / "Jamfile.v2"
-        if not jam.is_file():
-            jam = self.boost_path / "libs" / component / "build" / "Jamfile"
-        if not jam.is_file():
+        jam_info = self._jamfile_scanner.scan(component)
+        if jam_info is None:
             log.warning("Can't find Jamfile for %s. Unable to determine dependencies.", component)
             return []
-        contents = jam.open().read()
-
-        using = self._grep_libs("\n(.*)using\\s+([^ ;:]+)\\s*", contents)
-        libs = self._grep_libs("\n(.*)\\s(?:searched-)?lib\\s+([^ \t\n;:]+)", contents)
-
-        requirements = using + libs
-        return requirements
+        return jam_info.using + jam_info.libs
 
     def _sort_requirements(self, requirements: List[str]) -> Tuple[List[str], Dict[str, List[str]], List[str]]:
         conan_requirements = set()
@@ -227,7 +352,7 @@ class BoostDependencyBuilder(object):
         return list(conan_requirements), system_libs, list(unknown_libs)
 
     def do_boostdep_collect(self) -> BoostDependencies:
-        with chdir(self, self.boost_path):
+        with chdir(self, self.source_path):
             buildables = subprocess.check_output([self._boostdep, "--list-buildable"], text=True)
             buildables = buildables.splitlines()
             log.debug("`boostdep --list--buildable` returned these buildables: %s", buildables)
@@ -280,6 +405,8 @@ class BoostDependencyBuilder(object):
                 dependencies=filtered_dependency_tree,
                 requirements=requirements,
                 static_only=[],
+                commit=self.commit,
+                generator=self.generator,
             ),
             buildables=buildables,
         )
@@ -329,6 +456,36 @@ class BoostDependencyBuilder(object):
             raise Exception(f"Dependency cycle detected. Remaining tree: {remaining_tree}")
         return deptree
 
+    @staticmethod
+    def compute_closure(deptree: Dict[str, List[str]]) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Compute the forward (dependencies) and reverse (super_modules) transitive closure of every module.
+        The module itself is not part of its own closure.
+        """
+        dependencies = {}
+
+        def visit(module: str) -> set:
+            if module not in dependencies:
+                closure = set()
+                for dep in deptree[module]:
+                    closure.add(dep)
+                    closure.update(visit(dep))
+                dependencies[module] = closure
+            return dependencies[module]
+
+        for module in deptree:
+            visit(module)
+
+        super_modules = {module: set() for module in deptree}
+        for module, deps in dependencies.items():
+            for dep in deps:
+                super_modules.setdefault(dep, set()).add(module)
+
+        return {
+            "dependencies": {k: sorted(v) for k, v in dependencies.items()},
+            "super_modules": {k: sorted(v) for k, v in super_modules.items()},
+        }
+
     @staticmethod
     def _boostify_library(lib: str) -> str:
         return f"boost_{lib}"
@@ -339,15 +496,10 @@ class BoostDependencyBuilder(object):
 
         #  Look for the names of libraries in Jam build files
         for buildable in boost_dependencies.buildables:
-            construct_jam = lambda jam_ext : self.boost_path / "libs" / buildable / "build" / f"Jamfile{jam_ext}"
-            try:
-                buildable_jam = next(construct_jam(jam_ext) for jam_ext in ("", ".v2") if construct_jam(jam_ext).is_file())
-            except StopIteration:
+            jam_info = self._jamfile_scanner.scan(buildable)
+            if jam_info is None:
                 raise Exception(f"Cannot find jam build file for {buildable}")
-            jam_text = buildable_jam.read_text()
-            buildable_libs = re.findall("[ \n](boost-)?lib ([a-zA-Z0-9_]+)[ \n]", jam_text)
-            buildable_libs = set(f"boost_{lib}" if lib_prefix else lib for lib_prefix, lib in buildable_libs)
-            buildable_libs = set(l[len("boost_"):] for l in buildable_libs if l.startswith("boost_"))  # list(filter(lambda l: l.startswith("boost"), buildable_libs))
+            buildable_libs = set(jam_info.boost_libs)
 
             if not buildable_libs:
                 # Some boost releases support multiple python versions
@@ -392,6 +544,10 @@ class BoostDependencyBuilder(object):
     def _outputpath(self) -> Path:
         return self.outputdir / f"dependencies-{self.boost_version}.yml"
 
+    @property
+    def _json_outputpath(self) -> Path:
+        return self.outputdir / f"dependencies-{self.boost_version}.json"
+
     @classmethod
     def _sort_item(cls, item):
         if isinstance(item, dict):
@@ -412,6 +568,7 @@ class BoostDependencyBuilder(object):
         tree = self.do_create_libraries(tree)
 
         tree.export.dependencies = self._fix_dependencies(tree.export.dependencies)
+        tree.export.closure = self.compute_closure(tree.export.dependencies)
 
         data = dataclasses.asdict(tree.export)
         if self.unsafe:
@@ -422,21 +579,74 @@ class BoostDependencyBuilder(object):
         print(f"Creating {self.outputdir}")
         with self._outputpath.open("w") as fout:
             yaml.dump(data, fout)
+        # Compact pre-serialized copy of the yml file, loaded by the recipe instead of parsing yaml
+        with self._json_outputpath.open("w") as fout:
+            json.dump(data, fout, sort_keys=True, separators=(",", ":"))
+            fout.write("\n")
+
+
+def benchmark_jamfile_scanner(boost_path: Path, repeat: int) -> None:
+    """Compare the Jamfile scanner with scanning every Jamfile once per query, as done before the scanner existed"""
+    modules = sorted(p.parent.parent.name for p in (boost_path / "libs").glob("*/build/Jamfile*"))
+
+    def naive_scan(module):
+        def read_jam(*jam_names):
+            for jam_name in jam_names:
+                jam = boost_path / "libs" / module / "build" / jam_name
+                if jam.is_file():
+                    return jam.read_text()
+            return ""
+
+        def grep_libs(regex, text):
+            res = set()
+            for m in regex.finditer(text):
+                if any(ign in m.group(1) for ign in ("#", "\"")):
+                    continue
+                l = m.group(2).lower()
+                if any(ign in l for ign in ("boost", "<", ">")):
+                    continue
+                res.add(l)
+            return list(res)
+
+        # same patterns as the scanner, only the reading and matching strategy differs
+        grep_libs(JamfileScanner._USING_RE, read_jam("Jamfile.v2", "Jamfile"))
+        grep_libs(JamfileScanner._LIB_RE, read_jam("Jamfile.v2", "Jamfile"))
+        JamfileScanner._BOOST_LIB_RE.findall(read_jam("Jamfile", "Jamfile.v2"))
+
+    def scanner_scan(module):
+        JamfileScanner(boost_path / "libs").scan(module)
+
+    print(f"Scanning {len(modules)} Jamfiles of {boost_path}, {repeat} times")
+    for name, scan in (("naive", naive_scan), ("scanner", scanner_scan)):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for module in modules:
+                scan(module)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>8}: {elapsed * 1000 / repeat:.2f} ms per scan of all Jamfiles")
+
+
+def _create_dependency_file(boost_collector: BoostDependencyBuilder) -> str:
+    boost_collector.do_create_dependency_file()
+    return boost_collector.boost_version
 
 
 def main(args=None) -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--verbose", dest="verbose", action="store_true", help="verbose output")
-    parser.add_argument("-t", dest="tmppath", help="temporary folder where to clone boost (default is system temporary folder)")
+    parser.add_argument("-t", dest="tmppath", type=Path, help="temporary folder where to clone boost (default is system temporary folder)")
     parser.add_argument("-d", dest="boostdep_version", default="1.82.0", type=str, help="boostdep version")
     parser.add_argument("-u", dest="git_url", default=BOOST_GIT_URL, help="boost git url")
     parser.add_argument("-U", dest="git_update", action="store_true", help="update the git repo")
     parser.add_argument("-o", dest="outputdir", default=None, type=Path, help="output dependency dir")
     parser.add_argument("-x", dest="unsafe", action="store_true", help="unsafe fast(er) operation")
+    parser.add_argument("-j", dest="jobs", default=1, type=int, help="number of versions to scan in parallel (uses one git worktree per version)")
+    parser.add_argument("-f", dest="force", action="store_true", help="also regenerate dependency files that are up to date with their boost tag and this script")
 
     version_group = parser.add_mutually_exclusive_group(required=True)
-    version_group.add_argument("-v", dest="boost_version", help="boost version")
-    version_group.add_argument("-A", dest="boost_version", action="store_const", const=None, help="All boost versions")
+    version_group.add_argument("-v", dest="boost_versions", nargs="+", help="boost version(s)")
+    version_group.add_argument("-A", dest="boost_versions", action="store_const", const=None, help="All boost versions")
+    version_group.add_argument("-B", dest="benchmark", type=int, default=0, metavar="REPEAT", help="benchmark the Jamfile scanner on the boost checkout and exit")
     ns = parser.parse_args(args)
 
     logging.basicConfig(format="[%(levelname)s] %(message)s")
@@ -446,44 +656,74 @@ def main(args=None) -> int:
     if not ns.tmppath:
         ns.tmppath = Path(tempfile.gettempdir())
     print(f"Temporary folder is {ns.tmppath}")
+    if ns.benchmark:
+        benchmark_jamfile_scanner(ns.tmppath / "boost", ns.benchmark)
+        return 0
+
     if not ns.outputdir:
         ns.outputdir = Path("dependencies")
     print(f"Dependencies folder is {ns.outputdir}")
 
     ns.outputdir.mkdir(exist_ok=True)
 
-    git_update_done = False
-
-    if ns.boost_version is None:
+    if ns.boost_versions is None:
         conan_data = yaml.safe_load(Path("conandata.yml").open())
         boost_versions = list(conan_data["sources"].keys())
     else:
-        boost_versions = [ns.boost_version]
+        boost_versions = ns.boost_versions
 
-    for boost_version in boost_versions:
-        print(f"Starting {boost_version}")
-        boost_collector = BoostDependencyBuilder(
+    use_worktree = ns.jobs > 1
+    boost_collectors = [
+        BoostDependencyBuilder(
             boost_version=boost_version,
             boostdep_version=ns.boostdep_version,
             git_url=ns.git_url,
             outputdir=ns.outputdir,
             tmppath=ns.tmppath,
             unsafe=ns.unsafe,
+            worktree=use_worktree,
         )
-
-        if not ns.git_update and not boost_collector.boost_path.exists():
-            log.error("Boost directory does not exist. Re-execute this script with -U to run 'git update'.")
-            return 1
-
-        if ns.git_update and not git_update_done:
-            boost_collector.do_git_update()
-            git_update_done = True
-
-        boost_collector.do_git_submodule_update()
-
-        boost_collector.do_install_boostdep()
-
-        boost_collector.do_create_dependency_file()
+        for boost_version in boost_versions
+    ]
+    if not boost_collectors:
+        return 0
+
+    main_collector = boost_collectors[0]
+    if not ns.git_update and not main_collector.boost_path.exists():
+        log.error("Boost directory does not exist. Re-execute this script with -U to run 'git update'.")
+        return 1
+
+    if ns.git_update:
+        main_collector.do_git_update()
+
+    if not ns.force:
+        up_to_date = [c for c in boost_collectors if c.is_up_to_date()]
+        for boost_collector in up_to_date:
+            print(f"Skipping {boost_collector.boost_version}: dependency file is up to date with commit {boost_collector.commit}")
+        boost_collectors = [c for c in boost_collectors if c not in up_to_date]
+        if not boost_collectors:
+            return 0
+
+    boostdep = main_collector.do_install_boostdep()
+
+    if not use_worktree:
+        for boost_collector in boost_collectors:
+            print(f"Starting {boost_collector.boost_version}")
+            boost_collector.do_git_submodule_update()
+            boost_collector._boostdep = boostdep
+            boost_collector.do_create_dependency_file()
+        return 0
+
+    main_collector.do_git_submodule_fetch()
+    for boost_collector in boost_collectors:
+        print(f"Preparing worktree of {boost_collector.boost_version}")
+        boost_collector.do_git_worktree_update()
+        boost_collector._boostdep = boostdep
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=ns.jobs) as executor:
+        futures = [executor.submit(_create_dependency_file, boost_collector) for boost_collector in boost_collectors]
+        for future in concurrent.futures.as_completed(futures):
+            print(f"Finished {future.result()}")
     return 0
 
 
@@ -1,3 +1,4 @@
+import hashlib
 import os
 import re
 import textwrap
@@ -5,6 +6,7 @@ import textwrap
 from conan import ConanFile
 from conan.errors import ConanInvalidConfiguration
 from conan.tools.apple import is_apple_os, fix_apple_shared_install_name
+from conan.tools.build import cross_building
 from conan.tools.env import VirtualRunEnv
 from conan.tools.files import apply_conandata_patches, copy, export_conandata_patches, get, load, mkdir, replace_in_file, rm, rmdir, save, unzip
 from conan.tools.gnu import Autotools, AutotoolsToolchain, AutotoolsDeps, PkgConfigDeps
@@ -30,6 +32,7 @@ class CPythonConan(ConanFile):
         "fPIC": [True, False],
         "optimizations": [True, False],
         "lto": [True, False],
+        "pgo_training_script": [None, "ANY"],
         "docstrings": [True, False],
         "pymalloc": [True, False],
         "with_bz2": [True, False],
@@ -48,6 +51,7 @@ class CPythonConan(ConanFile):
         "fPIC": True,
         "optimizations": False,
         "lto": False,
+        "pgo_training_script": None,
         "docstrings": True,
         "pymalloc": True,
         "with_bz2": True,
@@ -93,6 +97,8 @@ class CPythonConan(ConanFile):
     def configure(self):
         if self.options.shared:
             self.options.rm_safe("fPIC")
+        if not self.options.optimizations:
+            self.options.rm_safe("pgo_training_script")
         if not self._supports_modules:
             self.options.rm_safe("with_bz2")
             self.options.rm_safe("with_sqlite3")
@@ -144,8 +150,18 @@ class CPythonConan(ConanFile):
         if self.options.get_safe("with_lzma", False):
             self.requires("xz_utils/5.4.5")
 
+    @staticmethod
+    def _sha256sum(file_path):
+        m = hashlib.sha256()
+        with open(file_path, "rb") as fh:
+            for data in iter(lambda: fh.read(8192), b""):
+                m.update(data)
+        return m.hexdigest()
+
     def package_id(self):
         del self.info.options.env_vars
+        if self.info.options.get_safe("pgo_training_script"):
+            self.info.options.pgo_training_script = self._sha256sum(str(self.info.options.pgo_training_script))
 
     def validate(self):
         if self.options.shared:
@@ -153,16 +169,14 @@ class CPythonConan(ConanFile):
                 raise ConanInvalidConfiguration(
                     "cpython does not support MT(d) runtime when building a shared cpython library"
                 )
+        if self.options.get_safe("pgo_training_script") and not os.path.isfile(str(self.options.pgo_training_script)):
+            raise ConanInvalidConfiguration("Non-existent pgo_training_script specified")
         if is_msvc(self):
             if self.options.optimizations:
-                raise ConanInvalidConfiguration(
-                    "This recipe does not support optimized MSVC cpython builds (yet)"
-                )
-                # FIXME: should probably throw when cross building
-                # FIXME: optimizations for Visual Studio, before building the final `build_type`:
-                # 1. build the MSVC PGInstrument build_type,
-                # 2. run the instrumented binaries, (PGInstrument should have created a `python.bat` file in the PCbuild folder)
-                # 3. build the MSVC PGUpdate build_type
+                if cross_building(self):
+                    raise ConanInvalidConfiguration("Optimized MSVC cpython builds run the instrumented interpreter, they can't be cross built")
+                if self.settings.build_type == "Debug":
+                    raise ConanInvalidConfiguration("Optimized MSVC cpython builds require a release build_type")
             if self.settings.build_type == "Debug" and "d" not in msvc_runtime_flag(self):
                 raise ConanInvalidConfiguration(
                     "Building debug cpython requires a debug runtime (Debug cpython requires _CrtReportMode"
@@ -204,6 +218,9 @@ class CPythonConan(ConanFile):
             "--with-system-libmpdec",
             "--with-openssl={}".format(self.dependencies["openssl"].package_folder),
         ]
+        if self.options.get_safe("pgo_training_script"):
+            # Replaces the default `-m test --pgo` training run of --enable-optimizations
+            tc.configure_args.append("PROFILE_TASK={}".format(os.path.abspath(str(self.options.pgo_training_script))))
         if Version(self.version) < "3.12":
             tc.configure_args.append("--with-system-ffi")
         if Version(self.version) >= "3.10":
@@ -244,12 +261,15 @@ class CPythonConan(ConanFile):
 
         if is_msvc(self):
             # The msbuild generator only works with Visual Studio
-            deps = MSBuildDeps(self)
-            deps.generate()
-            # The toolchain.props is not injected yet, but it also generates VCVars
-            toolchain = MSBuildToolchain(self)
-            toolchain.properties["IncludeExternals"] = "true"
-            toolchain.generate()
+            for configuration in self._msvc_configurations:
+                deps = MSBuildDeps(self)
+                deps.configuration = configuration
+                deps.generate()
+                # The toolchain.props is not injected yet, but it also generates VCVars
+                toolchain = MSBuildToolchain(self)
+                toolchain.configuration = configuration
+                toolchain.properties["IncludeExternals"] = "true"
+                toolchain.generate()
         else:
             self._generate_autotools()
 
@@ -522,18 +542,45 @@ class CPythonConan(ConanFile):
         }
         return archs
 
-    def _msvc_build(self):
+    @property
+    def _msvc_configurations(self):
+        # Same flow as `PCbuild/build.bat --pgo`
+        if self.options.optimizations:
+            return ["PGInstrument", "PGUpdate"]
+        return [str(self.settings.build_type)]
+
+    def _msvc_build_configuration(self, configuration):
         msbuild = MSBuild(self)
+        msbuild.build_type = configuration
         msbuild.platform = self._msvc_archs[str(self.settings.arch)]
 
         projects = self._solution_projects
-        self.output.info(f"Building {len(projects)} Visual Studio projects: {projects}")
+        self.output.info(f"Building {len(projects)} Visual Studio projects ({configuration}): {projects}")
 
         sln = os.path.join(self.source_folder, "PCbuild", "pcbuild.sln")
         # FIXME: Solution files do not pick up the toolset automatically.
         cmd = msbuild.command(sln, targets=projects)
         self.run(f"{cmd} /p:PlatformToolset={msvs_toolset(self)}")
 
+    def _msvc_pgo_train(self):
+        instrumented_path = os.path.join(self._msvc_artifacts_path, "instrumented")
+        self._copy_essential_dlls(instrumented_path)
+        rm(self, "*.pgc", instrumented_path)
+        rmdir(self, os.path.join(self.source_folder, "Lib", "__pycache__"))
+        python_instrumented = os.path.join(instrumented_path, "python.exe")
+        if self.options.pgo_training_script:
+            self.run(f'"{python_instrumented}" "{os.path.abspath(str(self.options.pgo_training_script))}"')
+        else:
+            # Like build.bat, test failures don't invalidate the collected profile
+            self.run(f'"{python_instrumented}" -m test --pgo', ignore_errors=True)
+        rmdir(self, os.path.join(self.source_folder, "Lib", "__pycache__"))
+
+    def _msvc_build(self):
+        for configuration in self._msvc_configurations:
+            self._msvc_build_configuration(configuration)
+            if configuration == "PGInstrument":
+                self._msvc_pgo_train()
+
     def build(self):
         self._patch_sources()
         if is_msvc(self):
@@ -558,11 +605,11 @@ class CPythonConan(ConanFile):
     def _msvc_install_subprefix(self):
         return "bin"
 
-    def _copy_essential_dlls(self):
+    def _copy_essential_dlls(self, dest_path=None):
         if is_msvc(self):
             # Until MSVC builds support cross building, copy dll's of essential (shared) dependencies to python binary location.
             # These dll's are required when running the layout tool using the newly built python executable.
-            dest_path = os.path.join(self.build_folder, self._msvc_artifacts_path)
+            dest_path = dest_path or os.path.join(self.build_folder, self._msvc_artifacts_path)
             for bin_path in self.dependencies["libffi"].cpp_info.bindirs:
                 copy(self, "*.dll", src=bin_path, dst=dest_path)
             for bin_path in self.dependencies["expat"].cpp_info.bindirs:
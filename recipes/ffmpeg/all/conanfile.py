@@ -1,10 +1,10 @@
 from conan import ConanFile, conan_version
-from conan.errors import ConanInvalidConfiguration
-from conan.tools.apple import is_apple_os
+from conan.errors import ConanException, ConanInvalidConfiguration
+from conan.tools.apple import XCRun, is_apple_os
 from conan.tools.build import cross_building
 from conan.tools.env import Environment, VirtualBuildEnv, VirtualRunEnv
 from conan.tools.files import (
-    apply_conandata_patches, chdir, copy, export_conandata_patches, get, rename,
+    apply_conandata_patches, chdir, copy, export_conandata_patches, get, mkdir, rename,
     replace_in_file, rm, rmdir, save, load
 )
 from conan.tools.gnu import Autotools, AutotoolsDeps, AutotoolsToolchain, PkgConfigDeps
@@ -74,10 +74,14 @@ class FFMpegConan(ConanFile):
         "with_libsvtav1": [True, False],
         "with_libaom": [True, False],
         "with_libdav1d": [True, False],
+        "with_libjxl": [True, False],
+        "with_libzimg": [True, False],
+        "with_libsoxr": [True, False],
         "with_libdrm": [True, False],
         "with_jni": [True, False],
         "with_mediacodec": [True, False],
         "with_xlib": [True, False],
+        "optimization": ["default", "lto", "pgo"],
         "disable_everything": [True, False],
         "disable_all_encoders": [True, False],
         "disable_encoders": [None, "ANY"],
@@ -158,10 +162,14 @@ class FFMpegConan(ConanFile):
         "with_libsvtav1": True,
         "with_libaom": True,
         "with_libdav1d": True,
+        "with_libjxl": False,
+        "with_libzimg": False,
+        "with_libsoxr": False,
         "with_libdrm": False,
         "with_jni": False,
         "with_mediacodec": False,
         "with_xlib": True,
+        "optimization": "default",
         "disable_everything": False,
         "disable_all_encoders": False,
         "disable_encoders": None,
@@ -233,6 +241,9 @@ class FFMpegConan(ConanFile):
             "with_libsvtav1": ["avcodec"],
             "with_libaom": ["avcodec"],
             "with_libdav1d": ["avcodec"],
+            "with_libjxl": ["avcodec"],
+            "with_libzimg": ["avfilter"],
+            "with_libsoxr": ["swresample"],
             "with_mediacodec": ["with_jni"],
             "with_xlib": ["avdevice"],
         }
@@ -241,6 +252,10 @@ class FFMpegConan(ConanFile):
     def _version_supports_libsvtav1(self):
         return Version(self.version) >= "5.1.0"
 
+    @property
+    def _version_supports_libjxl(self):
+        return Version(self.version) >= "5.1.0"
+
     def export_sources(self):
         export_conandata_patches(self)
 
@@ -269,6 +284,8 @@ class FFMpegConan(ConanFile):
             del self.options.with_mediacodec
         if not self._version_supports_libsvtav1:
             self.options.rm_safe("with_libsvtav1")
+        if not self._version_supports_libjxl:
+            self.options.rm_safe("with_libjxl")
         if self.settings.os == "Android":
             del self.options.with_libfdk_aac
 
@@ -338,6 +355,12 @@ class FFMpegConan(ConanFile):
             self.requires("dav1d/1.4.3")
         if self.options.get_safe("with_libdrm"):
             self.requires("libdrm/2.4.119")
+        if self.options.get_safe("with_libjxl"):
+            self.requires("libjxl/0.10.3")
+        if self.options.with_libzimg:
+            self.requires("zimg/3.0.5")
+        if self.options.with_libsoxr:
+            self.requires("soxr/0.1.3")
 
     def validate(self):
         if self.options.with_ssl == "securetransport" and not is_apple_os(self):
@@ -358,6 +381,21 @@ class FFMpegConan(ConanFile):
             # Linking fails with "Argument list too long" for some reason on Conan v1
             raise ConanInvalidConfiguration("MSVC shared build is not supported for Conan v1")
 
+        if self.options.optimization in ["lto", "pgo"] and not self.options.shared and self.settings.compiler != "gcc":
+            # static libraries would only contain LTO bitcode, which consumers can't link without the same toolchain
+            raise ConanInvalidConfiguration(
+                f"{self.ref} optimization={self.options.optimization} with static libraries is only supported with gcc, "
+                "use shared=True")
+        if self.options.optimization == "pgo":
+            if self.settings.compiler not in ["gcc", "clang", "apple-clang"] or self.settings.compiler.get_safe("runtime"):
+                raise ConanInvalidConfiguration(f"{self.ref} optimization=pgo is only supported with gcc and clang")
+            if cross_building(self):
+                raise ConanInvalidConfiguration(f"{self.ref} optimization=pgo can't run its training workload when cross-building")
+            if not (self.options.with_programs and self.options.avcodec and self.options.avformat and self.options.avfilter):
+                raise ConanInvalidConfiguration(
+                    f"{self.ref} optimization=pgo requires with_programs, avcodec, avformat and avfilter, "
+                    "the training workload is run with the ffmpeg program")
+
         if Version(self.version) == "7.0.1" and self.settings.build_type == "Debug":
             # FIXME: FFMpeg fails to build in Debug mode with the following error:
             # ld: libavcodec/libavcodec.a(vvcdsp_init.o): in function `ff_vvc_put_pixels2_8_sse4':
@@ -528,6 +566,8 @@ class FFMpegConan(ConanFile):
             opt_enable_disable("securetransport", self.options.with_ssl == "securetransport"),
             opt_enable_disable("vulkan", self.options.get_safe("with_vulkan")),
             opt_enable_disable("libdav1d", self.options.get_safe("with_libdav1d")),
+            opt_enable_disable("libzimg", self.options.with_libzimg),
+            opt_enable_disable("libsoxr", self.options.with_libsoxr),
             opt_enable_disable("jni", self.options.get_safe("with_jni")),
             opt_enable_disable("mediacodec", self.options.get_safe("with_mediacodec")),
             opt_enable_disable("xlib", self.options.get_safe("with_xlib")),
@@ -601,6 +641,8 @@ class FFMpegConan(ConanFile):
 
         if self._version_supports_libsvtav1:
             args.append(opt_enable_disable("libsvtav1", self.options.get_safe("with_libsvtav1")))
+        if self._version_supports_libjxl:
+            args.append(opt_enable_disable("libjxl", self.options.get_safe("with_libjxl")))
         if is_apple_os(self):
             # relocatable shared libs
             args.append("--install-name-dir=@rpath")
@@ -614,6 +656,11 @@ class FFMpegConan(ConanFile):
             ])
         if not self.options.with_programs:
             args.append("--disable-programs")
+        if self.options.optimization in ["lto", "pgo"]:
+            args.append("--enable-lto")
+            if not self.options.shared:
+                # also emit regular object code, so that consumers can link the static libraries without LTO
+                tc.extra_cflags.append("-ffat-lto-objects")
         # since ffmpeg"s build system ignores CC and CXX
         compilers_from_conf = self.conf.get("tools.build:compiler_executables", default={}, check_type=dict)
         buildenv_vars = VirtualBuildEnv(self).vars()
@@ -725,7 +772,85 @@ class FFMpegConan(ConanFile):
             with chdir(self, self.generators_folder):
                 shutil.copy("x264.pc", "libx264.pc")
         autotools = Autotools(self)
-        autotools.configure()
+        if self.options.optimization == "pgo":
+            self._build_with_pgo(autotools)
+        else:
+            autotools.configure()
+            autotools.make()
+
+    @property
+    def _pgo_profile_folder(self):
+        return os.path.join(self.build_folder, "pgo-profile")
+
+    @property
+    def _pgo_training_commands(self):
+        # Offline workload: streams are generated by lavfi sources, encoded with native
+        # encoders, then decoded back through swscale and swresample. Steps relying on
+        # components disabled by the user fail and are skipped.
+        source = ("testsrc2=size=1280x720:rate=25:duration=4,format=yuv420p[v];"
+                  "sine=frequency=440:sample_rate=48000:duration=4[a]")
+        return [
+            f'-filter_complex "{source}" -map "[v]" -map "[a]" -c:v mpeg4 -q:v 4 -c:a aac -f matroska pgo-mpeg4.mkv',
+            f'-filter_complex "{source}" -map "[v]" -c:v mjpeg -q:v 3 -f matroska pgo-mjpeg.mkv',
+            f'-filter_complex "{source}" -map "[v]" -c:v ffv1 -f matroska pgo-ffv1.mkv',
+            "-i pgo-mpeg4.mkv -vf scale=640:360:flags=bicubic -af aresample=44100 -f null -",
+            "-i pgo-mjpeg.mkv -vf scale=854:480:flags=bilinear -f null -",
+            "-i pgo-ffv1.mkv -vf scale=1920:1080:flags=lanczos,format=yuv444p -f null -",
+        ]
+
+    def _pgo_flags(self, stage):
+        profile_folder = unix_path(self, self._pgo_profile_folder)
+        if stage == "generate":
+            return [f"-fprofile-generate={profile_folder}"]
+        if self.settings.compiler == "gcc":
+            # profiles of multi-threaded code may be slightly inconsistent
+            return [f"-fprofile-use={profile_folder}", "-fprofile-correction", "-Wno-missing-profile"]
+        profdata = unix_path(self, os.path.join(self._pgo_profile_folder, "ffmpeg.profdata"))
+        return [f"-fprofile-use={profdata}", "-Wno-profile-instr-unprofiled", "-Wno-profile-instr-out-of-date"]
+
+    def _run_pgo_training(self):
+        training_folder = os.path.join(self.build_folder, "pgo-training")
+        mkdir(self, training_folder)
+        ffmpeg = unix_path(self, os.path.join(self.build_folder, "ffmpeg"))
+        env = Environment()
+        if self.options.shared:
+            libdirs = [os.path.join(self.build_folder, f"lib{name}")
+                       for name in ["avutil", "avcodec", "avformat", "avfilter", "avdevice", "swscale", "swresample", "postproc"]]
+            for var in ["LD_LIBRARY_PATH", "DYLD_LIBRARY_PATH", "PATH"]:
+                env.prepend_path(var, libdirs)
+        succeeded = 0
+        with env.vars(self).apply(), chdir(self, training_folder):
+            for command in self._pgo_training_commands:
+                try:
+                    self.run(f"{ffmpeg} -nostdin -hide_banner -loglevel error -y {command}", env="conanbuild")
+                    succeeded += 1
+                except ConanException as e:
+                    self.output.warning(f"PGO training step skipped: {e}")
+        if not succeeded:
+            raise ConanException("PGO training workload didn't run, no profile to optimize with")
+
+    def _merge_pgo_profiles(self):
+        # clang writes raw profiles which have to be indexed first, gcc reads its .gcda files directly
+        if self.settings.compiler == "gcc":
+            return
+        llvm_profdata = XCRun(self).find("llvm-profdata") if is_apple_os(self) else "llvm-profdata"
+        profraw_files = " ".join(unix_path(self, f) for f in glob.glob(os.path.join(self._pgo_profile_folder, "*.profraw")))
+        profdata = unix_path(self, os.path.join(self._pgo_profile_folder, "ffmpeg.profdata"))
+        self.run(f"{llvm_profdata} merge -output={profdata} {profraw_files}", env="conanbuild")
+
+    def _build_with_pgo(self, autotools):
+        rmdir(self, self._pgo_profile_folder)
+        # 1. instrumented build
+        flags = " ".join(self._pgo_flags("generate"))
+        autotools.configure(args=[f"--extra-cflags={flags}", f"--extra-ldflags={flags}"])
+        autotools.make()
+        # 2. training
+        self._run_pgo_training()
+        self._merge_pgo_profiles()
+        # 3. optimized build
+        autotools.make(target="clean")
+        flags = " ".join(self._pgo_flags("use"))
+        autotools.configure(args=[f"--extra-cflags={flags}", f"--extra-ldflags={flags}"])
         autotools.make()
 
     def package(self):
@@ -806,7 +931,7 @@ class FFMpegConan(ConanFile):
         if self.options.swscale:
             _add_component("swscale", [])
         if self.options.swresample:
-            _add_component("swresample", [])
+            swresample = _add_component("swresample", [])
         if self.options.postproc:
             _add_component("postproc", [])
 
@@ -896,6 +1021,8 @@ class FFMpegConan(ConanFile):
                 avcodec.requires.append("libaom-av1::libaom-av1")
             if self.options.get_safe("with_libdav1d"):
                 avcodec.requires.append("dav1d::dav1d")
+            if self.options.get_safe("with_libjxl"):
+                avcodec.requires.extend(["libjxl::jxl", "libjxl::jxl_threads"])
 
         if self.options.avformat:
             if self.options.with_bzip2:
@@ -912,6 +1039,8 @@ class FFMpegConan(ConanFile):
                 avfilter.requires.append("freetype::freetype")
             if self.options.with_zeromq:
                 avfilter.requires.append("zeromq::libzmq")
+            if self.options.with_libzimg:
+                avfilter.requires.append("zimg::zimg")
             if self.options.get_safe("with_appkit"):
                 avfilter.frameworks.append("AppKit")
             if self.options.get_safe("with_coreimage"):
@@ -919,6 +1048,10 @@ class FFMpegConan(ConanFile):
             if Version(self.version) >= "5.0" and is_apple_os(self):
                 avfilter.frameworks.append("Metal")
 
+        if self.options.swresample:
+            if self.options.with_libsoxr:
+                swresample.requires.append("soxr::core")
+
         if self.options.get_safe("with_libdrm"):
             avutil.requires.append("libdrm::libdrm_libdrm")
         if self.options.get_safe("with_vaapi"):
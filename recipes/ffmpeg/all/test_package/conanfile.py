@@ -24,3 +24,13 @@ class TestPackageConan(ConanFile):
         if can_run(self):
             bin_path = os.path.join(self.cpp.build.bindirs[0], "test_package")
             self.run(bin_path, env="conanrun")
+
+            ffmpeg_options = self.dependencies[self.tested_reference_str].options
+            graphs = []
+            if ffmpeg_options.avfilter and ffmpeg_options.with_libzimg:
+                graphs.append("zscale")
+            if ffmpeg_options.avfilter and ffmpeg_options.swresample and ffmpeg_options.with_libsoxr:
+                graphs.append("soxr")
+            if graphs:
+                bin_path = os.path.join(self.cpp.build.bindirs[0], "test_filters")
+                self.run(f"{bin_path} {' '.join(graphs)}", env="conanrun")
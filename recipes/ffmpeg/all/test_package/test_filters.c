@@ -0,0 +1,93 @@
+#include <libavfilter/avfilter.h>
+#include <libavfilter/buffersink.h>
+#include <libavutil/frame.h>
+#include <libavutil/mem.h>
+#include <libavutil/time.h>
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+/* Frames are generated inside the graph, so no input file or decoder is needed */
+static const char *zscale_graph =
+    "testsrc2=size=1920x1080:rate=30:duration=4,format=yuv420p,"
+    "zscale=width=1280:height=720:filter=spline36,format=yuv420p";
+static const char *soxr_graph =
+    "sine=frequency=1000:sample_rate=48000:duration=20,"
+    "aresample=resampler=soxr:out_sample_rate=44100";
+
+static int run_graph(const char *name, const char *description, int audio)
+{
+    AVFilterGraph *graph = avfilter_graph_alloc();
+    AVFilterContext *sink = NULL;
+    AVFilterInOut *inputs = avfilter_inout_alloc();
+    AVFilterInOut *outputs = NULL;
+    AVFrame *frame = av_frame_alloc();
+    int64_t start;
+    double elapsed;
+    int frames = 0;
+    int ret;
+
+    if (!graph || !inputs || !frame) {
+        ret = AVERROR(ENOMEM);
+        goto end;
+    }
+
+    ret = avfilter_graph_create_filter(&sink, avfilter_get_by_name(audio ? "abuffersink" : "buffersink"),
+                                       "out", NULL, NULL, graph);
+    if (ret < 0)
+        goto end;
+
+    inputs->name = av_strdup("out");
+    inputs->filter_ctx = sink;
+    inputs->pad_idx = 0;
+    inputs->next = NULL;
+
+    if ((ret = avfilter_graph_parse_ptr(graph, description, &inputs, &outputs, NULL)) < 0)
+        goto end;
+    if ((ret = avfilter_graph_config(graph, NULL)) < 0)
+        goto end;
+
+    start = av_gettime_relative();
+    while ((ret = av_buffersink_get_frame(sink, frame)) >= 0) {
+        frames++;
+        av_frame_unref(frame);
+    }
+    if (ret == AVERROR_EOF)
+        ret = 0;
+    elapsed = (av_gettime_relative() - start) / 1000000.0;
+
+    if (ret == 0) {
+        printf("%s: %d frames in %.3f s (%.1f fps)\n", name, frames, elapsed,
+               elapsed > 0 ? frames / elapsed : 0.0);
+    }
+
+end:
+    if (ret < 0)
+        fprintf(stderr, "%s: filter graph failed (%d)\n", name, ret);
+    av_frame_free(&frame);
+    avfilter_inout_free(&inputs);
+    avfilter_inout_free(&outputs);
+    avfilter_graph_free(&graph);
+    return ret;
+}
+
+int main(int argc, char **argv)
+{
+    int i;
+
+    for (i = 1; i < argc; i++) {
+        if (strcmp(argv[i], "zscale") == 0) {
+            if (run_graph("zscale", zscale_graph, 0) < 0)
+                return EXIT_FAILURE;
+        } else if (strcmp(argv[i], "soxr") == 0) {
+            if (run_graph("soxr", soxr_graph, 1) < 0)
+                return EXIT_FAILURE;
+        } else {
+            fprintf(stderr, "unknown filter graph: %s\n", argv[i]);
+            return EXIT_FAILURE;
+        }
+    }
+
+    return EXIT_SUCCESS;
+}
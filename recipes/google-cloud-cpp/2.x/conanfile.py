@@ -1,4 +1,6 @@
+import json
 import os
+import sys
 
 from conan import ConanFile
 from conan.tools.build import check_min_cppstd, cross_building
@@ -19,9 +21,23 @@ from conan.errors import ConanInvalidConfiguration
 # script will be used to generate a new file with the component dependency
 # information. The expectation is that maintaining this script will be easier
 # than writing long lists of dependencies by hand.
-import components_2_15_1
-import components_2_19_0
-import components_2_28_0
+#
+# The information is stored in one `components_<version>.json` file per
+# version, loaded only for the version being used, and cached for the
+# lifetime of the process. The dependencies of the proto components are
+# stored as a few shared sets plus per-component extras.
+_COMPONENTS_CACHE = {}
+
+
+def _load_components(filename):
+    with open(filename, encoding="utf-8") as f:
+        data = json.load(f)
+    dependency_sets = {name: [sys.intern(d) for d in deps] for name, deps in data.pop("dependency_sets").items()}
+    data["dependencies"] = {
+        component: dependency_sets.get(entry.get("set"), []) + [sys.intern(d) for d in entry["extra"]]
+        for component, entry in data["dependencies"].items()
+    }
+    return data
 
 required_conan_version = ">=1.56.0"
 
@@ -45,33 +61,28 @@ class GoogleCloudCppConan(ConanFile):
     settings = "os", "arch", "compiler", "build_type"
     options = {"shared": [True, False], "fPIC": [True, False]}
     default_options = {"shared": False, "fPIC": True}
-    exports = ["components_2_15_1.py",
-               "components_2_19_0.py",
-               "components_2_28_0.py",
-               ]
+    exports = ["components_*.json"]
 
     short_paths = True
 
-    _GA_COMPONENTS = {
-        '2.15.1': components_2_15_1.COMPONENTS,
-        '2.19.0': components_2_19_0.COMPONENTS,
-        '2.28.0': components_2_28_0.COMPONENTS,
-    }
-    _PROTO_COMPONENTS = {
-        '2.15.1': components_2_15_1.PROTO_COMPONENTS,
-        '2.19.0': components_2_19_0.PROTO_COMPONENTS,
-        '2.28.0': components_2_28_0.PROTO_COMPONENTS,
-    }
-    _PROTO_COMPONENT_DEPENDENCIES = {
-        "2.15.1": components_2_15_1.DEPENDENCIES,
-        "2.19.0": components_2_19_0.DEPENDENCIES,
-        "2.28.0": components_2_28_0.DEPENDENCIES,
-    }
     # Some components require custom dependency definitions.
     _REQUIRES_CUSTOM_DEPENDENCIES = {
         "bigquery", "bigtable", "iam", "oauth2", "pubsub", "spanner", "storage",
     }
 
+    @property
+    def _components_filename(self):
+        return os.path.join(self.recipe_folder, f"components_{str(self.version).replace('.', '_')}.json")
+
+    @property
+    def _components_data(self):
+        filename = self._components_filename
+        if filename not in _COMPONENTS_CACHE:
+            if not os.path.isfile(filename):
+                return None
+            _COMPONENTS_CACHE[filename] = _load_components(filename)
+        return _COMPONENTS_CACHE[filename]
+
     @property
     def _is_legacy_one_profile(self):
         return not hasattr(self, "settings_build")
@@ -103,20 +114,9 @@ class GoogleCloudCppConan(ConanFile):
                 "Recipe not prepared for cross-building (yet)"
             )
 
-        if str(self.version) not in self._GA_COMPONENTS:
-            print(f"{type(self.version)} {self.version}")
-            raise ConanInvalidConfiguration(
-                f"The components are unknown for version {self.version}. Expected one of {self._GA_COMPONENTS.keys()}"
-            )
-
-        if str(self.version) not in self._PROTO_COMPONENTS:
-            raise ConanInvalidConfiguration(
-                f"The proto components are unknown for version {self.version}. Expected one of {self._PROTO_COMPONENTS.keys()}"
-            )
-
-        if str(self.version) not in self._PROTO_COMPONENT_DEPENDENCIES:
+        if self._components_data is None:
             raise ConanInvalidConfiguration(
-                f"The inter-component components are unknown for version {self.version}. Expected one of {self._PROTO_COMPONENT_DEPENDENCIES.keys()}"
+                f"The components are unknown for version {self.version}. Expected a {os.path.basename(self._components_filename)} file"
             )
 
         if (
@@ -198,8 +198,7 @@ class GoogleCloudCppConan(ConanFile):
         cmake.build()
 
     def _generate_proto_requires(self, component):
-        deps = self._PROTO_COMPONENT_DEPENDENCIES.get(self.version, dict())
-        return deps.get(component, [])
+        return self._components_data["dependencies"].get(component, [])
 
     _SKIPPED_COMPONENTS = {
         # Some protos do not compile due to inconvenient system macros clashing
@@ -213,7 +212,7 @@ class GoogleCloudCppConan(ConanFile):
     }
 
     def _components(self):
-        result = self._GA_COMPONENTS.get(str(self.version), []).copy()
+        result = self._components_data["components"].copy()
         for c in self._SKIPPED_COMPONENTS:
             result.remove(c)
         # TODO - these do not build on Android due to conflicts between OS
@@ -226,7 +225,7 @@ class GoogleCloudCppConan(ConanFile):
         return result
 
     def _proto_components(self):
-        result = self._PROTO_COMPONENTS.get(self.version, []).copy()
+        result = self._components_data["proto_components"].copy()
         for c in self._SKIPPED_COMPONENTS:
             result.remove(c + '_protos')
         # TODO - these do not build on Android due to conflicts between OS
@@ -237,7 +236,7 @@ class GoogleCloudCppConan(ConanFile):
         if Version(self.version) <= '2.19.0':
             # Handling of these proto libraries was simplified in the 2.28.0
             # `conanfile.py`. We prefer not to regenerate the old
-            # `components_*.py` files, so we manually skip the protos in here.
+            # `components_*.json` files, so we manually skip the protos in here.
             result.remove('logging_type_type_protos')
             result.remove('devtools_source_v1_source_context_protos')
         if self.settings.os == "Windows" and Version(self.version) >= '2.28.0':
@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 
 import argparse
+import collections
 import glob
+import json
 import os
 
 """Extract google-cloud-cpp's component dependency info for use in Conan.
@@ -17,6 +19,14 @@ and convert them to CMake dependencies.
 
 The *.deps files themselves are generated (and committed to GitHub) from
 Bazel rules.
+
+The output is a JSON document, to be saved as `components_<version>.json`
+(e.g. `components_2_28_0.json`) next to `conanfile.py`.
+
+Most *_protos libraries share the same long list of dependencies. To keep the
+file (and the recipe's memory use) small, the dependencies are factored into
+a few named shared sets (`dependency_sets`), and each component only lists
+the shared set it uses and its extra dependencies.
 """
 
 # Used in _generate_proto_requires(): common requirements
@@ -229,8 +239,45 @@ def _generate_proto_requires(depfile):
     return list(_PROTO_DEPS_COMMON_REQUIRES) + requires
 
 
+def _factor_dependencies(dependencies, max_sets=16):
+    """Factor the dependency lists into named shared sets plus per-component deltas."""
+    deps = {component: set(d) for component, d in dependencies.items()}
+    counts = collections.Counter(frozenset(d) for d in deps.values())
+    candidates = [c for c, n in counts.items() if n > 1 and len(c) > 1]
+    shared_sets = []
+    base = {component: frozenset() for component in deps}
+    while len(shared_sets) < max_sets:
+        best, best_savings = None, 0
+        for candidate in candidates:
+            # Entries removed from the components that would use this set, minus the cost of storing it
+            savings = sum(
+                len(candidate) - len(base[component])
+                for component, d in deps.items()
+                if candidate <= d and len(candidate) > len(base[component])
+            ) - len(candidate)
+            if savings > best_savings:
+                best, best_savings = candidate, savings
+        if best is None:
+            break
+        shared_sets.append(best)
+        candidates.remove(best)
+        for component, d in deps.items():
+            if best <= d and len(best) > len(base[component]):
+                base[component] = best
+
+    names = {s: f"shared_{i}" for i, s in enumerate(shared_sets)}
+    factored = dict()
+    for component, d in deps.items():
+        entry = dict()
+        if base[component]:
+            entry["set"] = names[base[component]]
+        entry["extra"] = sorted(d - base[component])
+        factored[component] = entry
+    return {names[s]: sorted(s) for s in shared_sets}, factored
+
+
 def main():
-    """Generate a python file representing the google-cloud-cpp proto deps."""
+    """Generate a JSON file representing the google-cloud-cpp proto deps."""
     parser = argparse.ArgumentParser(description=(__doc__))
     parser.add_argument(
         "-s",
@@ -240,8 +287,7 @@ def main():
     args = parser.parse_args()
     source_folder = vars(args)["source_folder"]
     deps_folder = os.path.join(source_folder, "external", "googleapis", "protodeps")
-    print("# Automatically generated by %s DO NOT EDIT" % __file__)
-    print("DEPENDENCIES = {")
+    dependencies = dict()
     proto_components = _PROTO_BASE_COMPONENTS.copy()
     files = sorted(glob.glob(os.path.join(deps_folder, "*.deps")))
     experimental = set(_experimental_components(source_folder))
@@ -261,24 +307,25 @@ def main():
         deps = _generate_proto_requires(filename)
         proto_components.add(component)
         proto_components.update(deps)
-        print(f'    "{component}": {sorted(deps)},')
+        dependencies[component] = sorted(deps)
     for component in sorted(_HARD_CODED_DEPENDENCIES.keys()):
         deps = _HARD_CODED_DEPENDENCIES[component]
         proto_components.add(component)
         proto_components.update(deps)
-        print(f'    "{component}": {sorted(deps)},')
-    print(f'    "cloud_extended_operations_protos": ["protobuf::libprotobuf"],')
-    print(f'    "compute_protos": ["cloud_extended_operations_protos", "protobuf::libprotobuf"],')
+        dependencies[component] = sorted(deps)
+    dependencies["cloud_extended_operations_protos"] = ["protobuf::libprotobuf"]
+    dependencies["compute_protos"] = ["cloud_extended_operations_protos", "protobuf::libprotobuf"]
     proto_components.add("cloud_extended_operations_protos")
     proto_components.add("compute_protos")
-    print("}")
     proto_components = proto_components - _PROTO_DEPS_COMMON_REQUIRES
-    names = ['"%s"' % c for c in proto_components]
-    joined = ",\n    ".join(sorted(names))
-    print(f"\nPROTO_COMPONENTS = {{\n    {joined}\n}}")
-    names = ['"%s"' % c for c in components]
-    joined = ",\n    ".join(sorted(names))
-    print(f"\nCOMPONENTS = {{\n    {joined}\n}}")
+    dependency_sets, dependencies = _factor_dependencies(dependencies)
+    data = {
+        "dependency_sets": dependency_sets,
+        "dependencies": dependencies,
+        "proto_components": sorted(proto_components),
+        "components": sorted(components),
+    }
+    print(json.dumps(data, sort_keys=True, separators=(",", ":")))
 
 
 if __name__ == "__main__":
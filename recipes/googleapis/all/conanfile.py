@@ -1,17 +1,19 @@
 import functools
 import glob
+import hashlib
+import json
 import os
 
 from conan import ConanFile
 from conan.errors import ConanInvalidConfiguration
-from conan.tools.build import check_min_cppstd
+from conan.tools.build import build_jobs, check_min_cppstd
 from conan.tools.cmake import CMake, CMakeDeps, CMakeToolchain, cmake_layout
 from conan.tools.env import VirtualBuildEnv, VirtualRunEnv
 from conan.tools.files import apply_conandata_patches, copy, export_conandata_patches, get
 from conan.tools.microsoft import is_msvc
 from conan.tools.scm import Version
 
-from helpers import parse_proto_libraries
+from helpers import load_proto_libraries, parse_all_proto_libraries, save_proto_libraries
 
 required_conan_version = ">=1.60.0 <2 || >=2.0.5"
 
@@ -90,34 +92,56 @@ class GoogleAPIS(ConanFile):
         deps = CMakeDeps(self)
         deps.generate()
 
-    @functools.lru_cache(1)
-    def _parse_proto_libraries(self):
-        # Generate the libraries to build dynamically
-        proto_libraries = []
-        for filename in glob.iglob(os.path.join(self.source_folder, 'google', '**', 'BUILD.bazel'), recursive=True):
-            proto_libraries += parse_proto_libraries(filename, self.source_folder, self.output.error)
+    _PROTO_LIBRARIES_CACHE_FILE = "conan_proto_libraries.json"
 
-        for filename in glob.iglob(os.path.join(self.source_folder, 'grafeas', '**', 'BUILD.bazel'), recursive=True):
-            proto_libraries += parse_proto_libraries(filename, self.source_folder, self.output.error)
+    @property
+    def _proto_libraries_cache_key(self):
+        # The parsed libraries depend on the sources, the patches applied to them and the parser
+        sha256 = hashlib.sha256()
+        sha256.update(json.dumps(self.conan_data["sources"][str(self.version)], sort_keys=True).encode())
+        sha256.update(json.dumps(self.conan_data.get("patches", {}).get(str(self.version), []), sort_keys=True).encode())
+        with open(os.path.join(self.recipe_folder, "helpers.py"), "rb") as f:
+            sha256.update(f.read())
+        return sha256.hexdigest()
+
+    def _load_proto_libraries(self):
+        cache_file = os.path.join(self.source_folder, self._PROTO_LIBRARIES_CACHE_FILE)
+        cache_key = self._proto_libraries_cache_key
+        proto_libraries = load_proto_libraries(cache_file, cache_key)
+        if proto_libraries is not None:
+            self.output.info(f"Using proto libraries parsed previously from {cache_file}")
+            return proto_libraries
+
+        # Generate the libraries to build dynamically
+        filenames = sorted(glob.glob(os.path.join(self.source_folder, 'google', '**', 'BUILD.bazel'), recursive=True))
+        filenames += sorted(glob.glob(os.path.join(self.source_folder, 'grafeas', '**', 'BUILD.bazel'), recursive=True))
+        proto_libraries = parse_all_proto_libraries(filenames, self.source_folder, self.output.error, jobs=build_jobs(self))
 
         # Validate that all files exist and all dependencies are found
-        all_deps = [f"{it.qname}:{it.name}" for it in proto_libraries]
-        all_deps += ["protobuf::libprotobuf"]
+        all_deps = {f"{it.qname}:{it.name}" for it in proto_libraries}
+        all_deps.add("protobuf::libprotobuf")
         for it in proto_libraries:
             it.validate(self.source_folder, all_deps)
 
-        # Mark the libraries we need recursively (C++ context)
-        all_dict = {f"{it.qname}:{it.name}": it for it in proto_libraries}
+        save_proto_libraries(cache_file, cache_key, proto_libraries)
+        return proto_libraries
 
-        def activate_library(proto_library):
+    @functools.lru_cache(1)
+    def _parse_proto_libraries(self):
+        proto_libraries = self._load_proto_libraries()
+
+        # Mark the libraries we need (C++ context): everything reachable from a C++ library.
+        # Every library is visited only once, and without recursion.
+        all_dict = {f"{it.qname}:{it.name}": it for it in proto_libraries}
+        worklist = [key for key, it in all_dict.items() if it.is_used]
+        visited = set(worklist)
+        while worklist:
+            proto_library = all_dict[worklist.pop()]
             proto_library.is_used = True
             for it_dep in proto_library.deps:
-                if it_dep == "protobuf::libprotobuf":
-                    continue
-                activate_library(all_dict[it_dep])
-
-        for it in filter(lambda u: u.is_used, proto_libraries):
-            activate_library(it)
+                if it_dep != "protobuf::libprotobuf" and it_dep not in visited:
+                    visited.add(it_dep)
+                    worklist.append(it_dep)
 
         # Tweaks
         def deactivate_library(key):
@@ -163,16 +187,28 @@ class GoogleAPIS(ConanFile):
 
         return proto_libraries
 
+    _USED_PROTO_LIBRARIES_FILE = "conan_used_proto_libraries.json"
+
+    @functools.lru_cache(1)
+    def _used_proto_libraries(self):
+        # The libraries to build are computed in build() and saved to the build folder, so package() can reuse them
+        used_file = os.path.join(self.build_folder, self._USED_PROTO_LIBRARIES_FILE)
+        proto_libraries = load_proto_libraries(used_file, self._proto_libraries_cache_key)
+        if proto_libraries is None:
+            proto_libraries = [it for it in self._parse_proto_libraries() if it.is_used]
+        return proto_libraries
+
     def build(self):
         apply_conandata_patches(self)
-        proto_libraries = self._parse_proto_libraries()
+        proto_libraries = [it for it in self._parse_proto_libraries() if it.is_used]
+        save_proto_libraries(os.path.join(self.build_folder, self._USED_PROTO_LIBRARIES_FILE), self._proto_libraries_cache_key, proto_libraries)
         # Use a separate file to host the generated code, which is generated in full each time.
         # This is safe to call multiple times, for example, if you need to invoke `conan build` more than
         # once.
         with open(os.path.join(self.source_folder, "generated_targets.cmake"), "w", encoding="utf-8") as f:
             f.write("# Generated C++ library targets for googleapis\n")
             f.write("# DO NOT EDIT - change the generation code in conanfile.py instead\n")
-            for it in filter(lambda u: u.is_used, proto_libraries):
+            for it in proto_libraries:
                 f.write(it.cmake_content)
         cmake = CMake(self)
         cmake.configure()
@@ -192,7 +228,7 @@ class GoogleAPIS(ConanFile):
         copy(self, pattern="*.a", src=self.build_folder, dst=os.path.join(self.package_folder, "lib"), keep_path=False)
 
         with open(os.path.join(self.package_folder, self._DEPS_FILE), "w", encoding="utf-8") as f:
-            for lib in filter(lambda u: u.is_used, self._parse_proto_libraries()):
+            for lib in self._used_proto_libraries():
                 interface = 'LIB' if lib.srcs else 'INTERFACE'
                 f.write(f"{lib.cmake_target} {interface} {','.join(lib.cmake_deps)}\n")
 
@@ -1,7 +1,13 @@
+from concurrent.futures import ProcessPoolExecutor
+import json
 import os
 import re
+import sys
 import textwrap
 
+# Conan renames this module once the recipe is loaded, keep a reference to register it again for the process pool
+_this_module = sys.modules[__name__]
+
 class _ProtoLibrary:
     name: str = None
     qname: str = None
@@ -24,15 +30,27 @@ class _ProtoLibrary:
         for it in self.deps:
             assert it in all_deps, f"{self.qname}:{self.name} - dep '{it}' not found"
 
-    def dumps(self):
-        import json
-        return json.dumps({
+    def to_dict(self):
+        return {
             "name": self.name,
             "qname": self.qname,
             "srcs": self.srcs,
-            "deps": list(self.deps),
+            "deps": sorted(self.deps),
             "is_cc": self.is_cc,
-        }, indent=4)
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        proto_library = cls(is_cc=data["is_cc"])
+        proto_library.name = data["name"]
+        proto_library.qname = data["qname"]
+        proto_library.srcs = data["srcs"]
+        proto_library.deps = set(data["deps"])
+        return proto_library
+
+    def dumps(self):
+        import json
+        return json.dumps(self.to_dict(), indent=4)
 
     @property
     def cmake_target(self):
@@ -188,3 +206,59 @@ def parse_proto_libraries(filename, source_folder, error):
                     action(line)
 
     return proto_libraries
+
+
+def _parse_proto_libraries_worker(filename, source_folder):
+    errors = []
+    proto_libraries = parse_proto_libraries(filename, source_folder, errors.append)
+    return [it.to_dict() for it in proto_libraries], errors
+
+
+def parse_all_proto_libraries(filenames, source_folder, error, jobs=1):
+    """Parse many BUILD.bazel files, using a pool of `jobs` processes"""
+    if jobs <= 1:
+        proto_libraries = []
+        for filename in filenames:
+            proto_libraries += parse_proto_libraries(filename, source_folder, error)
+        return proto_libraries
+
+    # The workers must be able to import this module by name (fork and spawn start methods)
+    previous_module = sys.modules.get(__name__)
+    sys.modules[__name__] = _this_module
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    try:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(_parse_proto_libraries_worker, filenames, [source_folder] * len(filenames), chunksize=64))
+    finally:
+        sys.path.pop(0)
+        if previous_module is None:
+            del sys.modules[__name__]
+        else:
+            sys.modules[__name__] = previous_module
+
+    proto_libraries = []
+    for libraries, errors in results:
+        for message in errors:
+            error(message)
+        proto_libraries += [_ProtoLibrary.from_dict(it) for it in libraries]
+    return proto_libraries
+
+
+def save_proto_libraries(filename, key, proto_libraries):
+    """Save the parsed libraries to a cache file, tagged with `key`"""
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump({"key": key, "libraries": [it.to_dict() for it in proto_libraries]}, f)
+
+
+def load_proto_libraries(filename, key):
+    """Load the parsed libraries from a cache file, or return None if there is none for `key`"""
+    if not os.path.isfile(filename):
+        return None
+    with open(filename, "r", encoding="utf-8") as f:
+        try:
+            data = json.load(f)
+        except ValueError:
+            return None
+    if data.get("key") != key:
+        return None
+    return [_ProtoLibrary.from_dict(it) for it in data["libraries"]]
@@ -1,5 +1,6 @@
+import json
 import os
-import yaml
+import re
 
 from conan import ConanFile
 from conan.errors import ConanInvalidConfiguration
@@ -7,12 +8,35 @@ from conan.tools.apple import is_apple_os
 from conan.tools.build import cross_building, valid_min_cppstd, check_min_cppstd
 from conan.tools.cmake import cmake_layout, CMake, CMakeToolchain, CMakeDeps
 from conan.tools.env import VirtualBuildEnv, VirtualRunEnv
-from conan.tools.files import apply_conandata_patches, copy, export_conandata_patches, get, rename, replace_in_file, rmdir
+from conan.tools.files import apply_conandata_patches, copy, export_conandata_patches, get, replace_in_file, rmdir, save
 from conan.tools.microsoft import check_min_vs, is_msvc
 from conan.tools.scm import Version
 
 required_conan_version = ">=1.60.0 <2 || >=2.0.5"
 
+# Parsed target info, keyed by (version, path of the generated file)
+_TARGET_INFO_CACHE = {}
+
+_CMAKE_ADD_TARGET_RE = re.compile(r"^add_(library|executable)\((\S+) (?:\w+ )?IMPORTED\)", re.MULTILINE)
+_CMAKE_TARGET_PROPERTIES_RE = re.compile(r"^set_target_properties\((\S+) PROPERTIES\n(.*?)^\)", re.MULTILINE | re.DOTALL)
+_CMAKE_LINK_LIBRARIES_RE = re.compile(r'^\s*INTERFACE_LINK_LIBRARIES "([^"]*)"', re.MULTILINE)
+_CMAKE_LINK_ONLY_RE = re.compile(r"^\\?\$<LINK_ONLY:(.*)>$")
+_TEMPLATE_PLACEHOLDER_RE = re.compile(r"@(\w+)@")
+
+# CMake targets of direct dependencies, as exported by the gRPC CMake config files
+_CMAKE_DEPENDENCY_TARGETS = {
+    "OpenSSL::SSL": "openssl::ssl",
+    "OpenSSL::Crypto": "openssl::crypto",
+    "ZLIB::ZLIB": "zlib::zlib",
+    "c-ares::cares": "c-ares::cares",
+    "re2::re2": "re2::re2",
+    "protobuf::libprotobuf": "protobuf::libprotobuf",
+    "protobuf::libprotoc": "protobuf::libprotoc",
+}
+
+# Imported targets handled in _grpc_components instead of being translated into requires
+_CMAKE_IGNORED_TARGETS = {"Threads::Threads"}
+
 
 class GrpcConan(ConanFile):
     name = "grpc"
@@ -59,7 +83,6 @@ class GrpcConan(ConanFile):
     }
 
     short_paths = True
-    _target_info = None
 
     @property
     def _grpc_plugin_template(self):
@@ -77,9 +100,6 @@ class GrpcConan(ConanFile):
     def _supports_libsystemd(self):
         return self.settings.os in ["Linux", "FreeBSD"] and Version(self.version) >= "1.52"
 
-    def export(self):
-        copy(self, f"target_info/grpc_{self.version}.yml", src=self.recipe_folder, dst=self.export_folder)
-
     def export_sources(self):
         copy(self, "conan_cmake_project_include.cmake", self.recipe_folder, os.path.join(self.export_sources_folder, "src"))
         copy(self, f"cmake/{self._grpc_plugin_template}", self.recipe_folder, os.path.join(self.export_sources_folder, "src"))
@@ -253,57 +273,133 @@ class GrpcConan(ConanFile):
         cmake.configure()
         cmake.build()
 
+    @property
+    def _target_info_file(self):
+        return os.path.join("res", "grpc", "conan_target_info.json")
+
     @property
     def target_info(self):
-        if self._target_info:
-            return self._target_info
-        target_info_file = os.path.join(self.recipe_folder, "target_info", f"grpc_{self.version}.yml")
-        with open(target_info_file) as f:
-            self._target_info = yaml.safe_load(f)
-        return self._target_info
+        target_info_file = os.path.join(self.package_folder, self._target_info_file)
+        key = (str(self.version), target_info_file)
+        if key not in _TARGET_INFO_CACHE:
+            with open(target_info_file) as f:
+                _TARGET_INFO_CACHE[key] = json.load(f)
+        return _TARGET_INFO_CACHE[key]
+
+    def _conan_requirement(self, cmake_target):
+        if cmake_target in _CMAKE_DEPENDENCY_TARGETS:
+            return _CMAKE_DEPENDENCY_TARGETS[cmake_target]
+        namespace, _, name = cmake_target.partition("::")
+        if namespace == "gRPC":
+            return "_grpc" if name == "grpc" else name
+        if namespace == "absl":
+            return f"abseil::absl_{name}"
+        if namespace == "opentelemetry-cpp":
+            return "opentelemetry-cpp::opentelemetry-cpp"
+        # Threads::Threads, system libs and libsystemd are handled in _grpc_components
+        if cmake_target not in _CMAKE_IGNORED_TARGETS:
+            self.output.warning(f"No Conan requirement known for CMake target {cmake_target}, it is not added to the components requires")
+        return None
+
+    def _extract_target_info(self):
+        """Build the target info from the CMake config files installed by gRPC"""
+        cmake_folder = os.path.join(self.package_folder, "lib", "cmake", "grpc")
+        targets = {}
+        plugins = []
+        for filename in ("gRPCTargets.cmake", "gRPCPluginTargets.cmake"):
+            path = os.path.join(cmake_folder, filename)
+            if not os.path.isfile(path):
+                continue
+            with open(path) as f:
+                content = f.read()
+            for kind, target in _CMAKE_ADD_TARGET_RE.findall(content):
+                if kind == "executable":
+                    plugins.append({"target": target, "executable": target.split("::", 1)[1]})
+                else:
+                    name = self._conan_requirement(target)
+                    targets[target] = {"name": name, "lib": target.split("::", 1)[1]}
+            for target, properties in _CMAKE_TARGET_PROPERTIES_RE.findall(content):
+                if target not in targets:
+                    continue
+                link_libraries = _CMAKE_LINK_LIBRARIES_RE.search(properties)
+                if not link_libraries:
+                    continue
+                requires = []
+                frameworks = []
+                for item in link_libraries.group(1).split(";"):
+                    link_only = _CMAKE_LINK_ONLY_RE.match(item)
+                    if link_only:
+                        item = link_only.group(1)
+                    if item.startswith("-framework "):
+                        frameworks.append(item.split()[1])
+                        continue
+                    requirement = self._conan_requirement(item) if "::" in item else None
+                    if requirement and requirement not in requires:
+                        requires.append(requirement)
+                if requires:
+                    targets[target]["requires"] = requires
+                if frameworks:
+                    targets[target]["frameworks"] = frameworks
+        return {"grpc_targets": list(targets.values()), "grpc_plugins": plugins}
 
     def package(self):
         copy(self, "LICENSE", src=self.source_folder, dst=os.path.join(self.package_folder, "licenses"))
         cmake = CMake(self)
         cmake.install()
 
+        target_info = self._extract_target_info()
+        target_info_file = os.path.join(self.package_folder, self._target_info_file)
+        with open(target_info_file, "w") as f:
+            json.dump(target_info, f, separators=(",", ":"))
+
         rmdir(self, os.path.join(self.package_folder, "lib", "cmake"))
         rmdir(self, os.path.join(self.package_folder, "lib", "pkgconfig"))
 
-        # Create one custom module file per executable in order to emulate
+        # Create a custom module file in order to emulate
         # CMake executables imported targets of grpc plugins.
-        for plugin_info in self.target_info["grpc_plugins"]:
-            target = plugin_info["target"]
-            executable = plugin_info["executable"]
-            option_name = executable.replace("grpc_", "")
-            if self.options.get_safe(option_name):
-                self._create_executable_module_file(target, executable)
+        plugins = [plugin_info for plugin_info in target_info["grpc_plugins"] if self._plugin_enabled(plugin_info)]
+        self._create_executable_module_files(plugins)
 
-    def _create_executable_module_file(self, target, executable):
-        module_abs_path = os.path.join(self.package_folder, self._module_path)
-
-        # Copy our CMake module template file to package folder
-        copy(self, self._grpc_plugin_template, src=os.path.join(self.source_folder, "cmake"), dst=module_abs_path)
-
-        # Rename it
-        dst_file = os.path.join(module_abs_path, f"{executable}.cmake")
-        rename(self, os.path.join(module_abs_path, self._grpc_plugin_template), dst_file)
+    def _plugin_enabled(self, plugin_info):
+        option_name = plugin_info["executable"].replace("grpc_", "")
+        return bool(self.options.get_safe(option_name))
 
-        # Replace placeholders
-        replace_in_file(self, dst_file, "@target_name@", target)
-        replace_in_file(self, dst_file, "@executable_name@", executable)
+    @staticmethod
+    def _render_template(template, values):
+        return _TEMPLATE_PLACEHOLDER_RE.sub(lambda m: values[m.group(1)], template)
 
-        find_program_var = "{}_PROGRAM".format(executable.upper())
-        replace_in_file(self, dst_file, "@find_program_variable@", find_program_var)
+    def _create_executable_module_files(self, plugins):
+        if not plugins:
+            return
+        module_abs_path = os.path.join(self.package_folder, self._module_path)
+        with open(os.path.join(self.source_folder, "cmake", self._grpc_plugin_template)) as f:
+            template = f.read()
 
         module_folder_depth = len(os.path.normpath(self._module_path).split(os.path.sep))
         rel_path = "".join(["../"] * module_folder_depth)
-        replace_in_file(self, dst_file, "@relative_path@", rel_path)
+
+        modules = []
+        for plugin_info in plugins:
+            executable = plugin_info["executable"]
+            content = self._render_template(template, {
+                "target_name": plugin_info["target"],
+                "executable_name": executable,
+                "find_program_variable": "{}_PROGRAM".format(executable.upper()),
+                "relative_path": rel_path,
+            })
+            modules.append(content)
+
+        # All enabled plugins in a single module injected in consumers
+        save(self, os.path.join(module_abs_path, self._grpc_plugins_module), "\n".join(modules))
 
     @property
     def _module_path(self):
         return os.path.join("lib", "cmake", "conan_trick")
 
+    @property
+    def _grpc_plugins_module(self):
+        return "grpc_plugins.cmake"
+
     @property
     def _grpc_components(self):
 
@@ -365,12 +461,8 @@ class GrpcConan(ConanFile):
         # Executable imported targets are added through custom CMake module files,
         # since conan generators don't know how to emulate these kind of targets.
         grpc_modules = []
-        for plugin_info in self.target_info["grpc_plugins"]:
-            executable = plugin_info["executable"]
-            option_name = executable.replace("grpc_", "")
-            if self.options.get_safe(option_name):
-                grpc_module_filename = "{}.cmake".format(executable)
-                grpc_modules.append(os.path.join(self._module_path, grpc_module_filename))
+        if any(self._plugin_enabled(plugin_info) for plugin_info in self.target_info["grpc_plugins"]):
+            grpc_modules.append(os.path.join(self._module_path, self._grpc_plugins_module))
         self.cpp_info.set_property("cmake_build_modules", grpc_modules)
 
         # TODO: to remove once conan v1 not supported anymore
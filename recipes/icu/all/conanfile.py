@@ -4,11 +4,11 @@ import os
 import shutil
 
 from conan import ConanFile
-from conan.errors import ConanInvalidConfiguration
+from conan.errors import ConanException, ConanInvalidConfiguration
 from conan.tools.apple import is_apple_os
 from conan.tools.build import cross_building, stdcpp_library, check_min_cppstd
 from conan.tools.env import Environment, VirtualBuildEnv
-from conan.tools.files import apply_conandata_patches, copy, export_conandata_patches, get, mkdir, rename, replace_in_file, rm, rmdir, save
+from conan.tools.files import apply_conandata_patches, copy, export_conandata_patches, get, mkdir, rename, replace_in_file, rm, rmdir, save, unzip
 from conan.tools.gnu import Autotools, AutotoolsToolchain
 from conan.tools.layout import basic_layout
 from conan.tools.microsoft import check_min_vs, is_msvc, unix_path
@@ -33,6 +33,8 @@ class ICUConan(ConanFile):
         "data_packaging": ["files", "archive", "library", "static"],
         "with_dyload": [True, False],
         "dat_package_file": [None, "ANY"],
+        "data_filter_file": [None, "ANY"],
+        "data_source_file": [None, "ANY"],
         "with_icuio": [True, False],
         "with_extras": [True, False],
     }
@@ -42,6 +44,8 @@ class ICUConan(ConanFile):
         "data_packaging": "archive",
         "with_dyload": True,
         "dat_package_file": None,
+        "data_filter_file": None,
+        "data_source_file": None,
         "with_icuio": True,
         "with_extras": False,
     }
@@ -72,6 +76,10 @@ class ICUConan(ConanFile):
     def _with_unit_tests(self):
         return not self.conf.get("tools.build:skip_test", default=True, check_type=bool)
 
+    @property
+    def _data_source_dir(self):
+        return os.path.join(self.source_folder, "source", "data")
+
     def export_sources(self):
         export_conandata_patches(self)
 
@@ -83,6 +91,8 @@ class ICUConan(ConanFile):
     def configure(self):
         if self.options.shared:
             self.options.rm_safe("fPIC")
+        if not self.options.data_filter_file:
+            self.options.rm_safe("data_source_file")
         if Version(self.version) >= "74.1":
             self.license = "Unicode-3.0"
 
@@ -90,6 +100,13 @@ class ICUConan(ConanFile):
         if self.options.dat_package_file:
             if not os.path.exists(str(self.options.dat_package_file)):
                 raise ConanInvalidConfiguration("Non-existent dat_package_file specified")
+        if self.options.data_filter_file:
+            if self.options.dat_package_file:
+                raise ConanInvalidConfiguration("data_filter_file and dat_package_file are mutually exclusive")
+            for option in ["data_filter_file", "data_source_file"]:
+                value = self.options.get_safe(option)
+                if value and not os.path.exists(str(value)):
+                    raise ConanInvalidConfiguration(f"Non-existent {option} specified")
         if Version(self.version) >= "75.1":
             if self.settings.compiler.cppstd:
                 check_min_cppstd(self, self._min_cppstd)
@@ -113,6 +130,10 @@ class ICUConan(ConanFile):
     def package_id(self):
         if self.info.options.dat_package_file:
             self.info.options.dat_package_file = self._sha256sum(str(self.info.options.dat_package_file))
+        if self.info.options.data_filter_file:
+            self.info.options.data_filter_file = self._sha256sum(str(self.info.options.data_filter_file))
+        if self.info.options.get_safe("data_source_file"):
+            self.info.options.data_source_file = self._sha256sum(str(self.info.options.data_source_file))
 
     def build_requirements(self):
         if self._settings_build.os == "Windows":
@@ -184,11 +205,19 @@ class ICUConan(ConanFile):
                 env.define("icu_cv_host_frag", "mh-msys-msvc")
             env.vars(self).save_script("conanbuild_icu_msvc")
 
+        if self.options.data_filter_file:
+            # https://unicode-org.github.io/icu/userguide/icu_data/buildtool.html
+            # Read by configure, which generates the data build rules from it
+            env = Environment()
+            env.define_path("ICU_DATA_FILTER_FILE", os.path.abspath(str(self.options.data_filter_file)))
+            env.vars(self).save_script("conanbuild_icu_data_filter")
+
     def _patch_sources(self):
         apply_conandata_patches(self)
 
-        if not self._with_unit_tests:
+        if not self._with_unit_tests and not self.options.data_filter_file:
             # Prevent any call to python during configuration, it's only needed for unit tests
+            # and for the data build tool
             replace_in_file(
                 self,
                 os.path.join(self.source_folder, "source", "configure"),
@@ -218,6 +247,20 @@ class ICUConan(ConanFile):
         # workaround for "No rule to make target 'out/tmp/dirs.timestamp'"
         save(self, os.path.join(self.build_folder, "data", "out", "tmp", "dirs.timestamp"), "")
 
+    def _prepare_data_sources(self):
+        # The data filter only applies when building data from its sources, which are
+        # not part of the icu4c-*-src tarball but of icu4c-*-data.zip
+        if self.options.data_source_file:
+            rmdir(self, self._data_source_dir)
+            unzip(self, str(self.options.data_source_file), destination=os.path.join(self.source_folder, "source"))
+        if not os.path.isfile(os.path.join(self._data_source_dir, "locales", "root.txt")):
+            raise ConanException(
+                f"{self.ref}:data_filter_file requires the ICU data sources, "
+                f"set {self.ref}:data_source_file to icu4c-{str(self.version).replace('.', '_')}-data.zip"
+            )
+        # otherwise the prebuilt archive is repackaged as is, ignoring the filter
+        rm(self, "*.dat", os.path.join(self._data_source_dir, "in"))
+
     def build(self):
         self._patch_sources()
 
@@ -226,6 +269,9 @@ class ICUConan(ConanFile):
             if dat_package_file:
                 shutil.copy(str(self.options.dat_package_file), dat_package_file[0])
 
+        if self.options.data_filter_file:
+            self._prepare_data_sources()
+
         autotools = Autotools(self)
         autotools.configure(build_script_folder=os.path.join(self.source_folder, "source"))
         autotools.make()
@@ -28,6 +28,9 @@ class LlamaCppConan(ConanFile):
         "with_examples": [True, False],
         "with_cuda": [True, False],
         "with_curl": [True, False],
+        "with_blas": [True, False],
+        "with_openmp": [True, False],
+        "cpu_instruction_set": ["native", "avx", "avx2", "avx512"],
     }
     default_options = {
         "shared": False,
@@ -35,6 +38,9 @@ class LlamaCppConan(ConanFile):
         "with_examples": False,
         "with_cuda": False,
         "with_curl": False,
+        "with_blas": False,
+        "with_openmp": True,
+        "cpu_instruction_set": "native",
     }
 
     @property
@@ -47,6 +53,28 @@ class LlamaCppConan(ConanFile):
             "gcc": "8"
         }
 
+    @property
+    def _ggml_option_prefix(self):
+        # ggml options were renamed from LLAMA_* to GGML_* when ggml moved to its own folder
+        return "GGML" if self.version >= Version("b3240") else "LLAMA"
+
+    @property
+    def _ggml_component(self):
+        return "common" if self.version >= Version("b3240") else "llama"
+
+    @property
+    def _supports_openmp(self):
+        # the OpenMP thread pool (and its CMake switch) doesn't exist in the older versions of this recipe
+        return self.version >= Version("b3240")
+
+    @property
+    def _instruction_set_features(self):
+        return {
+            "avx": {"AVX": True, "AVX2": False, "FMA": False, "F16C": False, "AVX512": False},
+            "avx2": {"AVX": True, "AVX2": True, "FMA": True, "F16C": True, "AVX512": False},
+            "avx512": {"AVX": True, "AVX2": True, "FMA": True, "F16C": True, "AVX512": True},
+        }
+
     def export_sources(self):
         export_conandata_patches(self)
         copy(self, "cmake/*", dst=self.export_sources_folder, src=self.recipe_folder)
@@ -54,6 +82,16 @@ class LlamaCppConan(ConanFile):
     def config_options(self):
         if self.settings.os == "Windows":
             del self.options.fPIC
+        if not self._supports_openmp:
+            del self.options.with_openmp
+        if is_apple_os(self):
+            # Accelerate is used instead
+            del self.options.with_blas
+            # apple-clang doesn't ship an OpenMP runtime
+            if self._supports_openmp:
+                self.options.with_openmp = False
+        if self.settings.arch not in ["x86", "x86_64"]:
+            del self.options.cpu_instruction_set
 
     def configure(self):
         if self.options.shared:
@@ -74,12 +112,17 @@ class LlamaCppConan(ConanFile):
     def requirements(self):
         if self.options.with_curl:
             self.requires("libcurl/[>=7.78 <9]")
+        if self.options.get_safe("with_blas"):
+            self.requires("openblas/0.3.27")
+        if self.options.get_safe("with_openmp") and self.settings.compiler in ["clang", "apple-clang"]:
+            self.requires("llvm-openmp/17.0.6")
 
     def source(self):
         get(self, **self.conan_data["sources"][self.version], strip_root=True)
 
     def generate(self):
         deps = CMakeDeps(self)
+        deps.set_property("openblas", "cmake_file_name", "BLAS")
         deps.generate()
 
         tc = CMakeToolchain(self)
@@ -89,8 +132,19 @@ class LlamaCppConan(ConanFile):
         tc.variables["LLAMA_CURL"] = self.options.get_safe("with_curl")
         tc.variables["BUILD_SHARED_LIBS"] = bool(self.options.shared)
         tc.variables["GGML_CUDA"] = self.options.get_safe("with_cuda")
-        if hasattr(self, "settings_build") and cross_building(self):
-            tc.variables["LLAMA_NATIVE"] = False
+        prefix = self._ggml_option_prefix
+        if self._supports_openmp:
+            tc.variables[f"{prefix}_OPENMP"] = self.options.with_openmp
+        if self.options.get_safe("with_blas"):
+            tc.variables[f"{prefix}_BLAS"] = True
+            tc.variables[f"{prefix}_BLAS_VENDOR"] = "OpenBLAS"
+        instruction_set = str(self.options.get_safe("cpu_instruction_set", "native"))
+        if instruction_set != "native":
+            tc.variables[f"{prefix}_NATIVE"] = False
+            for feature, enabled in self._instruction_set_features[instruction_set].items():
+                tc.variables[f"{prefix}_{feature}"] = enabled
+        elif hasattr(self, "settings_build") and cross_building(self):
+            tc.variables[f"{prefix}_NATIVE"] = False
         tc.generate()
 
     def build(self):
@@ -133,4 +187,15 @@ class LlamaCppConan(ConanFile):
         if is_apple_os(self):
             self.cpp_info.components["common"].frameworks.extend(["Foundation", "Accelerate", "Metal"])
         elif self.settings.os in ("Linux", "FreeBSD"):
-            self.cpp_info.components["common"].system_libs.extend(["dl", "m", "pthread", "gomp"])
+            self.cpp_info.components["common"].system_libs.extend(["dl", "m", "pthread"])
+
+        ggml = self.cpp_info.components[self._ggml_component]
+        if self.options.get_safe("with_blas"):
+            ggml.requires.append("openblas::openblas")
+            if self.version >= Version("b3240"):
+                ggml.defines.append("GGML_USE_BLAS")
+        if self.options.get_safe("with_openmp"):
+            if self.settings.compiler in ["clang", "apple-clang"]:
+                ggml.requires.append("llvm-openmp::llvm-openmp")
+            elif self.settings.compiler == "gcc":
+                ggml.system_libs.append("gomp")
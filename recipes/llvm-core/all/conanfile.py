@@ -1,5 +1,5 @@
 from conan import ConanFile
-from conan.errors import ConanInvalidConfiguration
+from conan.errors import ConanException, ConanInvalidConfiguration
 from conan.tools.apple import is_apple_os
 from conan.tools.build import check_min_cppstd, cross_building
 from conan.tools.cmake import CMake, CMakeDeps, CMakeToolchain, cmake_layout
@@ -17,16 +17,23 @@ from conan.tools.files import (
 )
 from conan.tools.microsoft import is_msvc, msvc_runtime_flag
 from conan.tools.scm import Version
+from cmake_exports import load_cmake_exports, split_link_only
 
+import hashlib
 import json
 import os
 from pathlib import Path
 import re
+import sys
 import textwrap
 
 
 required_conan_version = ">=1.62.0"
 
+# Decoded build info, keyed by (path, mtime) of the index file
+_BUILD_INFO_CACHE = {}
+_BUILD_INFO_FORMAT = 1
+
 # LLVM's default config is to enable all targets, but end users can significantly reduce
 # build times for the package by specifying only the targets they need as a
 # semi-colon delimited string in the value of the 'targets' option
@@ -64,6 +71,7 @@ class LLVMCoreConan(ConanFile):
     homepage = "https://llvm.org"
     url = "https://github.com/conan-io/conan-center-index"
     settings = "os", "arch", "compiler", "build_type"
+    exports = "cmake_exports.py"
     options = {
         "shared": [True, False],
         "fPIC": [True, False],
@@ -306,23 +314,19 @@ class LLVMCoreConan(ConanFile):
 
     def _update_component_dependencies(self, components):
         def _sanitized_components(deps_list):
-            match_genex = re.compile(r"""\\\$<LINK_ONLY:(.+)>""")
             replacements = {
                 "LibXml2::LibXml2": "libxml2::libxml2",
                 "ZLIB::ZLIB": "zlib::zlib"
             }
-            for dep in deps_list.split(";"):
-                match = match_genex.search(dep)
-                if match:
-                    yield match.group(1)
+            for dep in deps_list:
+                dep, _ = split_link_only(dep)
+                replacement = replacements.get(dep)
+                if replacement:
+                    yield replacement
+                elif dep.startswith("-l"):
+                    yield dep[2:]
                 else:
-                    replacement = replacements.get(dep)
-                    if replacement:
-                        yield replacement
-                    elif dep.startswith("-l"):
-                        yield dep[2:]
-                    else:
-                        yield dep
+                    yield dep
 
         def _parse_deps(deps_list):
             data = {
@@ -348,13 +352,10 @@ class LLVMCoreConan(ConanFile):
                     data["requires"].append(component)
             return data
 
-        # Can't use tools.files.load due to CRLF endings on Windows causing issues with Regular Expressions
-        cmake_exports = (self._package_folder_path / "lib" / "cmake" / "llvm" / "LLVMExports.cmake").read_text("utf-8")
-        match_dependencies = re.compile(
-            r'''^set_target_properties\((\w+).*\n?\s*INTERFACE_LINK_LIBRARIES\s+"(\S+)"''', re.MULTILINE)
-
-        for llvm_lib, dependencies in match_dependencies.findall(cmake_exports):
-            if llvm_lib in components:
+        cmake_exports = load_cmake_exports(self._package_folder_path / "lib" / "cmake" / "llvm" / "LLVMExports.cmake")
+        for llvm_lib, target in cmake_exports.items():
+            dependencies = target["properties"].get("INTERFACE_LINK_LIBRARIES")
+            if dependencies and llvm_lib in components:
                 components[llvm_lib].update(_parse_deps(dependencies))
 
     def _llvm_build_info(self):
@@ -413,16 +414,82 @@ class LLVMCoreConan(ConanFile):
            """)
         save(self, module_file, content)
 
+    def _cmake_exports_hash(self):
+        sha256 = hashlib.sha256()
+        for filename in ("LLVMConfig.cmake", "LLVMExports.cmake"):
+            sha256.update((self._package_folder_path / "lib" / "cmake" / "llvm" / filename).read_bytes())
+        return sha256.hexdigest()
+
+    @staticmethod
+    def _encode_build_info(build_info, exports_hash):
+        # Every name (components first, then external requirements and system libs) is stored once,
+        # component i is names[i] and its edges are indices into names
+        names = list(build_info["components"])
+        indices = {name: index for index, name in enumerate(names)}
+
+        def _index(name):
+            if name not in indices:
+                indices[name] = len(names)
+                names.append(name)
+            return indices[name]
+
+        components = [
+            [[_index(name) for name in data.get("requires", [])], [_index(name) for name in data.get("system_libs", [])]]
+            for data in build_info["components"].values()
+        ]
+        return {
+            "format": _BUILD_INFO_FORMAT,
+            "exports_sha256": exports_hash,
+            "native_arch": build_info["native_arch"],
+            "names": names,
+            "components": components,
+        }
+
+    @staticmethod
+    def _decode_build_info(index):
+        names = [sys.intern(name) for name in index["names"]]
+        return {
+            "components": {
+                names[i]: {"requires": [names[r] for r in requires], "system_libs": [names[l] for l in system_libs]}
+                for i, (requires, system_libs) in enumerate(index["components"])
+            },
+            "native_arch": index["native_arch"],
+        }
+
+    @staticmethod
+    def _load_build_info_index(path):
+        try:
+            with open(path, encoding="utf-8") as fp:
+                index = json.load(fp)
+        except (OSError, ValueError):
+            return None
+        return index if index.get("format") == _BUILD_INFO_FORMAT else None
+
     def _write_build_info(self):
-        build_info = self._llvm_build_info()
-        with open(self._build_info_file, "w", encoding="utf-8") as fp:
-            json.dump(build_info, fp, indent=2)
+        # The index is kept in the build folder too, and only regenerated when the CMake exports change
+        exports_hash = self._cmake_exports_hash()
+        cached_index_file = Path(self.build_folder) / self._build_info_file.name
+        index = self._load_build_info_index(cached_index_file)
+        if index is None or index["exports_sha256"] != exports_hash:
+            index = self._encode_build_info(self._llvm_build_info(), exports_hash)
+            save(self, cached_index_file.as_posix(), json.dumps(index, separators=(",", ":")))
+        copy(self, cached_index_file.name, self.build_folder, self._build_info_file.parent.as_posix())
 
-        return build_info
+        return self._decode_build_info(index)
 
     def _read_build_info(self) -> dict:
-        with open(self._build_info_file, encoding="utf-8") as fp:
-            return json.load(fp)
+        try:
+            key = (str(self._build_info_file), os.stat(self._build_info_file).st_mtime_ns)
+        except OSError:
+            key = None
+        if key not in _BUILD_INFO_CACHE:
+            index = self._load_build_info_index(self._build_info_file) if key else None
+            if index is None:
+                # the CMake exports it was generated from are not packaged, it can't be regenerated here
+                raise ConanException(f"{self.ref}: {self._build_info_file} is missing, unreadable or was written by "
+                                     f"another version of the recipe, rebuild the package with --build={self.ref}")
+            _BUILD_INFO_CACHE[key] = self._decode_build_info(index)
+        return _BUILD_INFO_CACHE[key]
 
     def package(self):
         copy(self, "LICENSE.TXT", self.source_folder, (self._package_folder_path / "licenses").as_posix())
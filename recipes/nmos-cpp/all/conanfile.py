@@ -3,6 +3,7 @@ from conan.errors import ConanInvalidConfiguration
 from conan.tools import build, files
 from conan.tools.cmake import CMake, CMakeDeps, CMakeToolchain, cmake_layout
 from conan.tools.scm import Version
+from cmake_exports import load_cmake_exports, split_link_only
 import json
 import os
 import re
@@ -32,6 +33,7 @@ class NmosCppConan(ConanFile):
     }
 
     short_paths = True
+    exports = "cmake_exports.py"
 
     def export_sources(self):
         files.export_conandata_patches(self)
@@ -124,13 +126,7 @@ class NmosCppConan(ConanFile):
     def _create_components_file_from_cmake_target_file(self, target_file_path):
         components = {}
 
-        target_content = files.load(self, target_file_path)
-
-        cmake_functions = re.findall(r"(?P<func>add_executable|add_library|set_target_properties)[\n|\s]*\([\n|\s]*(?P<args>[^)]*)\)", target_content)
-        for (cmake_function_name, cmake_function_args) in cmake_functions:
-            cmake_function_args = re.split(r"[\s|\n]+", cmake_function_args, maxsplit=2)
-
-            cmake_imported_target_name = cmake_function_args[0]
+        for cmake_imported_target_name, target in load_cmake_exports(target_file_path).items():
             cmake_target_nonamespace = cmake_imported_target_name.replace("nmos-cpp::", "")
             component_name = cmake_target_nonamespace.lower()
             # Conan component name cannot be the same as the package name
@@ -139,11 +135,10 @@ class NmosCppConan(ConanFile):
 
             components.setdefault(component_name, {"cmake_target": cmake_target_nonamespace})
 
-            if cmake_function_name == "add_executable":
+            if target["kind"] == "executable":
                 components[component_name]["exe"] = True
-            elif cmake_function_name == "add_library":
-                cmake_imported_target_type = cmake_function_args[1]
-                if cmake_imported_target_type in ["STATIC", "SHARED"]:
+            elif target["kind"] == "library":
+                if target["type"] in ["STATIC", "SHARED"]:
                     # library filenames are based on the target name by default
                     lib_name = cmake_target_nonamespace
                     # the filename may be changed by a straightforward command:
@@ -153,64 +148,60 @@ class NmosCppConan(ConanFile):
                     if lib_name == "Bonjour":
                         lib_name = "dnssd"
                     components[component_name]["libs"] = [lib_name]
-            elif cmake_function_name == "set_target_properties":
-                target_properties = re.findall(r"(?P<property>INTERFACE_[A-Z_]+)[\n|\s]+\"(?P<values>.+)\"", cmake_function_args[2])
-                for target_property in target_properties:
-                    property_type = target_property[0]
-                    # '\', '$' and '"' are escaped; '$' especially is important here
-                    # see https://github.com/conan-io/conan/blob/release/1.39/conans/client/generators/cmake_common.py#L43-L48
-                    property_values = re.sub(r"\\(.)", r"\1", target_property[1]).split(";")
-                    if property_type == "INTERFACE_LINK_LIBRARIES":
-                        for dependency in property_values:
-                            match_private = re.fullmatch(r"\$<LINK_ONLY:(.+)>", dependency)
-                            if match_private:
-                                dependency = match_private.group(1)
-                            # target dependencies can be treated fairly consistently
-                            if "::" in dependency or dependency in ["nlohmann_json_schema_validator"]:
-                                dependency = dependency.replace("nmos-cpp::", "")
-                                # Conan component name cannot be the same as the package name
-                                if dependency == "nmos-cpp":
-                                    dependency = "nmos-cpp-lib"
-                                # Conan packages for Boost, cpprestsdk, websocketpp, OpenSSL and Avahi have component names that (except for being lowercase) match the CMake targets
-                                # json-schema-validator overrides cmake_find_package[_multi] names and v2 cmake_target_name
-                                elif dependency == "nlohmann_json_schema_validator":
-                                    dependency = "json-schema-validator::json-schema-validator"
-                                # mdnsresponder overrides cmake_find_package[_multi] names
-                                elif dependency == "DNSSD::DNSSD":
-                                    dependency = "mdnsresponder::mdnsresponder"
-                                components[component_name].setdefault("requires" if not match_private else "requires_private", []).append(dependency.lower())
-                            elif "${_IMPORT_PREFIX}/lib/" in dependency:
-                                self.output.warn(f"{self.name} recipe does not handle {property_type} {dependency} (yet)")
-                            else:
-                                components[component_name].setdefault("system_libs", []).append(dependency)
-                    elif property_type == "INTERFACE_COMPILE_DEFINITIONS":
-                        for property_value in property_values:
-                            components[component_name].setdefault("defines", []).append(property_value)
-                    elif property_type == "INTERFACE_COMPILE_FEATURES":
-                        for property_value in property_values:
-                            if property_value not in ["cxx_std_11"]:
-                                self.output.warn(f"{self.name} recipe does not handle {property_type} {property_value} (yet)")
-                    elif property_type == "INTERFACE_COMPILE_OPTIONS":
-                        for property_value in property_values:
-                            # handle forced include (Visual Studio /FI, gcc -include) by relying on includedirs containing "include"
-                            property_value = property_value.replace("${_IMPORT_PREFIX}/include/", "")
-                            components[component_name].setdefault("cxxflags", []).append(property_value)
-                    elif property_type == "INTERFACE_INCLUDE_DIRECTORIES":
-                        for property_value in property_values:
-                            if property_value not in ["${_IMPORT_PREFIX}/include"]:
-                                self.output.warn(f"{self.name} recipe does not handle {property_type} {property_value} (yet)")
-                    elif property_type == "INTERFACE_LINK_OPTIONS":
-                        for property_value in property_values:
-                            # workaround required because otherwise "/ignore:4099" gets converted to "\ignore:4099.obj"
-                            # thankfully the MSVC linker accepts both '/' and '-' for the option specifier and Visual Studio
-                            # handles link options appearing in Link/AdditionalDependencies rather than Link/AdditionalOptions
-                            # because the CMake generators put them in INTERFACE_LINK_LIBRARIES rather than INTERFACE_LINK_OPTIONS
-                            # see https://github.com/conan-io/conan/pull/8812
-                            # and https://docs.microsoft.com/en-us/cpp/build/reference/linking?view=msvc-160#command-line
-                            property_value = re.sub(r"^/", r"-", property_value)
-                            components[component_name].setdefault("linkflags", []).append(property_value)
-                    else:
-                        self.output.warn(f"{self.name} recipe does not handle {property_type} (yet)")
+            # '\', '$' and '"' are escaped in the export file, load_cmake_exports has already unescaped the values
+            # see https://github.com/conan-io/conan/blob/release/1.39/conans/client/generators/cmake_common.py#L43-L48
+            for property_type, property_values in target["properties"].items():
+                if not property_type.startswith("INTERFACE_"):
+                    continue
+                if property_type == "INTERFACE_LINK_LIBRARIES":
+                    for dependency in property_values:
+                        dependency, private = split_link_only(dependency)
+                        # target dependencies can be treated fairly consistently
+                        if "::" in dependency or dependency in ["nlohmann_json_schema_validator"]:
+                            dependency = dependency.replace("nmos-cpp::", "")
+                            # Conan component name cannot be the same as the package name
+                            if dependency == "nmos-cpp":
+                                dependency = "nmos-cpp-lib"
+                            # Conan packages for Boost, cpprestsdk, websocketpp, OpenSSL and Avahi have component names that (except for being lowercase) match the CMake targets
+                            # json-schema-validator overrides cmake_find_package[_multi] names and v2 cmake_target_name
+                            elif dependency == "nlohmann_json_schema_validator":
+                                dependency = "json-schema-validator::json-schema-validator"
+                            # mdnsresponder overrides cmake_find_package[_multi] names
+                            elif dependency == "DNSSD::DNSSD":
+                                dependency = "mdnsresponder::mdnsresponder"
+                            components[component_name].setdefault("requires" if not private else "requires_private", []).append(dependency.lower())
+                        elif "${_IMPORT_PREFIX}/lib/" in dependency:
+                            self.output.warn(f"{self.name} recipe does not handle {property_type} {dependency} (yet)")
+                        else:
+                            components[component_name].setdefault("system_libs", []).append(dependency)
+                elif property_type == "INTERFACE_COMPILE_DEFINITIONS":
+                    for property_value in property_values:
+                        components[component_name].setdefault("defines", []).append(property_value)
+                elif property_type == "INTERFACE_COMPILE_FEATURES":
+                    for property_value in property_values:
+                        if property_value not in ["cxx_std_11"]:
+                            self.output.warn(f"{self.name} recipe does not handle {property_type} {property_value} (yet)")
+                elif property_type == "INTERFACE_COMPILE_OPTIONS":
+                    for property_value in property_values:
+                        # handle forced include (Visual Studio /FI, gcc -include) by relying on includedirs containing "include"
+                        property_value = property_value.replace("${_IMPORT_PREFIX}/include/", "")
+                        components[component_name].setdefault("cxxflags", []).append(property_value)
+                elif property_type == "INTERFACE_INCLUDE_DIRECTORIES":
+                    for property_value in property_values:
+                        if property_value not in ["${_IMPORT_PREFIX}/include"]:
+                            self.output.warn(f"{self.name} recipe does not handle {property_type} {property_value} (yet)")
+                elif property_type == "INTERFACE_LINK_OPTIONS":
+                    for property_value in property_values:
+                        # workaround required because otherwise "/ignore:4099" gets converted to "\ignore:4099.obj"
+                        # thankfully the MSVC linker accepts both '/' and '-' for the option specifier and Visual Studio
+                        # handles link options appearing in Link/AdditionalDependencies rather than Link/AdditionalOptions
+                        # because the CMake generators put them in INTERFACE_LINK_LIBRARIES rather than INTERFACE_LINK_OPTIONS
+                        # see https://github.com/conan-io/conan/pull/8812
+                        # and https://docs.microsoft.com/en-us/cpp/build/reference/linking?view=msvc-160#command-line
+                        property_value = re.sub(r"^/", r"-", property_value)
+                        components[component_name].setdefault("linkflags", []).append(property_value)
+                else:
+                    self.output.warn(f"{self.name} recipe does not handle {property_type} (yet)")
 
         # until https://github.com/sony/nmos-cpp/commit/9489d84098ddc8cc514b7e4d5afe740dee4518ee
         # direct dependency on nlohmann_json was missing
@@ -1,6 +1,7 @@
 import json
 import os
 import textwrap
+from concurrent.futures import ThreadPoolExecutor
 
 from conan import ConanFile
 from conan.errors import ConanInvalidConfiguration
@@ -524,29 +525,37 @@ class OpenCascadeConan(ConanFile):
             "CSF_objc": {},
         }
 
-        modules = {}
-
         # MODULES: lists all modules and all possible components per module
         modules_content = load(self, os.path.join(self.source_folder, "adm", "MODULES"))
-        packaged_libs_list = collect_libs(self, "lib")
+        packaged_libs = set(collect_libs(self, "lib"))
+        modules_components = []
         for module_line in modules_content.splitlines():
-            components = {}
             module_components = module_line.split()
-            components_list = [component for component in module_components[1:] if component in packaged_libs_list]
+            if module_components:
+                modules_components.append((module_components[0], [component for component in module_components[1:] if component in packaged_libs]))
+
+        # EXTERNLIB: stores dependencies of each component. External dependencies are prefixed with CSF_
+        component_names = [component_name for _, components_list in modules_components for component_name in components_list]
+        def _load_externlib(component_name):
+            return load(self, os.path.join(self.source_folder, "src", component_name, "EXTERNLIB")).splitlines()
+        with ThreadPoolExecutor(max_workers=min(16, len(component_names) or 1)) as executor:
+            externlibs = dict(zip(component_names, executor.map(_load_externlib, component_names)))
+
+        modules = {}
+        for module_name, components_list in modules_components:
+            components = {}
             for component_name in components_list:
                 component_deps = {}
-                # EXTERNLIB: stores dependencies of each component. External dependencies are prefixed with CSF_
-                externlib_content = load(self, os.path.join(self.source_folder, "src", component_name, "EXTERNLIB"))
-                for dependency in externlib_content.splitlines():
-                    if dependency.startswith("TK") and dependency in packaged_libs_list:
+                for dependency in externlibs[component_name]:
+                    if dependency.startswith("TK") and dependency in packaged_libs:
                         component_deps.setdefault("internals", []).append(dependency)
                     elif dependency.startswith("CSF_"):
                         deps_dict = csf_to_conan_dependencies[dependency]
                         for dep_type, deps in deps_dict.items():
                             if deps:
                                 component_deps.setdefault(dep_type, []).extend(deps)
-                components.update({component_name: component_deps})
-            modules.update({module_components[0]:components})
+                components[component_name] = component_deps
+            modules[module_name] = components
 
         return modules
 
@@ -15,6 +15,10 @@ import textwrap
 required_conan_version = ">=1.60.0 <2.0 || >=2.0.5"
 
 
+# Module graphs and their mandatory options resolution, keyed by version, settings and options values
+_OPENCV_MODULES_CACHE = {}
+_MANDATORY_OPTIONS_CACHE = {}
+
 OPENCV_MAIN_MODULES_OPTIONS = (
     "calib3d",
     "dnn",
@@ -362,8 +366,27 @@ class OpenCVConan(ConanFile):
             if not self._has_with_wayland_option:
                 self.options.with_gtk = True
 
+    @property
+    def _opencv_modules_cache_key(self):
+        return (str(self.version), tuple(self.settings.items()), tuple(self.options.items()))
+
     @property
     def _opencv_modules(self):
+        # The graph only depends on version, settings and options values: it's built once per combination,
+        # configure() may change options, which gives a new key
+        key = self._opencv_modules_cache_key
+        if key not in _OPENCV_MODULES_CACHE:
+            opencv_modules = self._build_opencv_modules()
+            # Only keep plain values in the cache, not option objects of the conanfile instance which built it
+            for values in opencv_modules.values():
+                values["is_built"] = bool(values.get("is_built"))
+                for field in ("system_libs", "frameworks"):
+                    if field in values:
+                        values[field] = [(bool(condition), libs) for condition, libs in values[field]]
+            _OPENCV_MODULES_CACHE[key] = opencv_modules
+        return _OPENCV_MODULES_CACHE[key]
+
+    def _build_opencv_modules(self):
         def imageformats_deps():
             components = []
             if self.options.get_safe("with_avif"):
@@ -934,34 +957,41 @@ class OpenCVConan(ConanFile):
         return opencv_modules
 
     def _get_mandatory_disabled_options(self, opencv_modules):
+        key = self._opencv_modules_cache_key
+        if key in _MANDATORY_OPTIONS_CACHE:
+            return _MANDATORY_OPTIONS_CACHE[key]
+
+        # Adjacency of each module option to its mandatory options which are still disabled
+        mandatory_graph = {option: [mandatory for mandatory in values.get("mandatory_options", []) if not self.options.get_safe(mandatory)]
+                           for option, values in opencv_modules.items()}
         direct_options_to_enable = {}
         transitive_options_to_enable = {}
 
-        # Check which direct options have to be enabled
         base_options = [option for option, values in opencv_modules.items()
                         if not values.get("no_option") and self.options.get_safe(option)]
         for base_option in base_options:
-            for mandatory_option in opencv_modules.get(base_option, {}).get("mandatory_options", []):
-                if not self.options.get_safe(mandatory_option):
-                    direct_options_to_enable.setdefault(mandatory_option, set()).add(base_option)
-
-        # Now traverse the graph to check which transitive options have to be enabled
-        def collect_transitive_options(base_option, option):
-            for mandatory_option in opencv_modules.get(option, {}).get("mandatory_options", []):
-                if not self.options.get_safe(mandatory_option):
-                    if mandatory_option not in transitive_options_to_enable:
-                        transitive_options_to_enable[mandatory_option] = set()
-                        collect_transitive_options(base_option, mandatory_option)
+            # Check which direct options have to be enabled
+            for mandatory_option in mandatory_graph[base_option]:
+                direct_options_to_enable.setdefault(mandatory_option, set()).add(base_option)
+
+            # Now traverse the graph of disabled mandatory options to check which transitive options have to be enabled
+            visited = {base_option}
+            stack = [base_option]
+            while stack:
+                for mandatory_option in mandatory_graph.get(stack.pop(), []):
+                    if mandatory_option in visited:
+                        continue
+                    visited.add(mandatory_option)
+                    stack.append(mandatory_option)
+                    transitive_options_to_enable.setdefault(mandatory_option, set())
                     if base_option not in direct_options_to_enable.get(mandatory_option, set()):
                         transitive_options_to_enable[mandatory_option].add(base_option)
 
-        for base_option in base_options:
-            collect_transitive_options(base_option, base_option)
-
-        return {
+        _MANDATORY_OPTIONS_CACHE[key] = {
             "direct": direct_options_to_enable,
             "transitive": transitive_options_to_enable,
         }
+        return _MANDATORY_OPTIONS_CACHE[key]
 
     def _solve_internal_dependency_graph(self, opencv_modules):
         disabled_options = self._get_mandatory_disabled_options(opencv_modules)
@@ -1705,7 +1735,7 @@ class OpenCVConan(ConanFile):
                 if self.settings.os != "Windows":
                     self.cpp_info.components[conan_component].includedirs.append(os.path.join("include", "opencv4"))
 
-                module_requires = values.get("requires", [])
+                module_requires = list(values.get("requires", []))
                 module_system_libs = []
                 for _condition, _system_libs in values.get("system_libs", []):
                     if _condition:
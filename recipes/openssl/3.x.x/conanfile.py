@@ -89,12 +89,14 @@ class OpenSSLConan(ConanFile):
         "no_zlib": [True, False],
         "openssldir": [None, "ANY"],
         "tls_security_level": [None, 0, 1, 2, 3, 4, 5],
+        "build_mode": ["full", "libs", "modules"],
     }
     default_options = {key: False for key in options.keys()}
     default_options["fPIC"] = True
     default_options["no_md2"] = True
     default_options["openssldir"] = None
     default_options["tls_security_level"] = None
+    default_options["build_mode"] = "full"
 
     @property
     def _is_clang_cl(self):
@@ -146,6 +148,13 @@ class OpenSSLConan(ConanFile):
         if self.settings.os == "iOS" and self.options.shared:
             raise ConanInvalidConfiguration("OpenSSL 3 does not support building shared libraries for iOS")
 
+        if self.options.build_mode == "modules":
+            if self.options.no_module:
+                raise ConanInvalidConfiguration(f"{self.ref}:build_mode=modules requires {self.ref}:no_module=False")
+            if not self._builds_dynamic_providers:
+                raise ConanInvalidConfiguration(
+                    f"{self.ref}:build_mode=modules requires {self.ref}:no_legacy=False or {self.ref}:no_fips=False")
+
     def build_requirements(self):
         if self._settings_build.os == "Windows":
             if not self.options.no_asm:
@@ -410,9 +419,12 @@ class OpenSSLConan(ConanFile):
             ])
 
         for option_name in self.default_options.keys():
-            if self.options.get_safe(option_name, False) and option_name not in ("shared", "fPIC", "openssldir", "tls_security_level", "capieng_dialog", "enable_capieng", "zlib", "no_fips", "no_md2"):
+            if self.options.get_safe(option_name, False) and option_name not in ("shared", "fPIC", "openssldir", "tls_security_level", "capieng_dialog", "enable_capieng", "zlib", "no_fips", "no_md2", "build_mode"):
                 self.output.info(f"Activated option: {option_name}")
                 args.append(option_name.replace("_", "-"))
+        if self.options.build_mode != "full":
+            # test programs are part of build_programs and never packaged
+            args.append("no-tests")
         return args
 
     def generate(self):
@@ -524,11 +536,50 @@ class OpenSSLConan(ConanFile):
                         replace_in_file(self, mkinstallvars_pl, "$values{$k} = $v;", """$v->[0] =~ s|\\\\|/|g; $values{$k} = $v;""")
                     else:
                         replace_in_file(self, mkinstallvars_pl, "$ENV{$k} = $v;", """$v =~ s|\\\\|/|g; $ENV{$k} = $v;""")
-            self._run_make()
+            self._run_make(targets=self._build_targets)
+
+    @property
+    def _builds_dynamic_providers(self):
+        # With module support, the legacy and FIPS providers are built as ossl-modules instead of into libcrypto
+        return not self.options.no_module and (not self.options.no_legacy or not self.options.get_safe("no_fips", True))
+
+    @property
+    def _build_targets(self):
+        # The default target also builds engines, tests and docs, none of them needed by the
+        # libs mode; the modules mode only builds the providers (FIPS, legacy)
+        if self.options.build_mode == "modules":
+            return ["build_modules"]
+        if self.options.build_mode == "libs":
+            targets = ["build_libs"]
+            if not self.options.no_apps:
+                targets.append("build_programs")
+            if self._builds_dynamic_providers:
+                targets.append("build_modules")
+            return targets
+        return None
+
+    @property
+    def _install_targets(self):
+        if self.options.build_mode == "libs":
+            targets = ["install_dev"]
+            if not self.options.no_apps:
+                targets.append("install_runtime")
+            if self._builds_dynamic_providers:
+                targets.append("install_modules")
+            return targets
+        return ["install_sw"]
 
     def _make_install(self):
         with chdir(self, self.source_folder):
-            self._run_make(targets=["install_sw"], parallel=False, install=True)
+            # In libs mode everything has been built already by _build_targets, the install rules
+            # only copy files into distinct folders and can run concurrently; full mode keeps the
+            # historical serial install_sw
+            self._run_make(targets=self._install_targets, parallel=self.options.build_mode != "full", install=True)
+
+    def _package_modules(self):
+        module_ext = {"Macos": "*.dylib", "Windows": "*.dll"}.get(str(self.settings.os), "*.so")
+        copy(self, module_ext, src=os.path.join(self.source_folder, "providers"),
+             dst=os.path.join(self.package_folder, "lib", "ossl-modules"))
 
     def build(self):
         self._make()
@@ -547,6 +598,10 @@ class OpenSSLConan(ConanFile):
 
     def package(self):
         copy(self, "*LICENSE*", src=self.source_folder, dst=os.path.join(self.package_folder, "licenses"))
+        if self.options.build_mode == "modules":
+            self._package_modules()
+            return
+
         self._make_install()
         if is_apple_os(self):
             fix_apple_shared_install_name(self)
@@ -628,6 +683,19 @@ class OpenSSLConan(ConanFile):
                             f"conan-official-{self.name}-variables.cmake")
 
     def package_info(self):
+        openssl_modules_dir = os.path.join(self.package_folder, "lib", "ossl-modules")
+        self.runenv_info.define_path("OPENSSL_MODULES", openssl_modules_dir)
+
+        # For legacy 1.x downstream consumers, remove once recipe is 2.0 only:
+        self.env_info.OPENSSL_MODULES = openssl_modules_dir
+
+        if self.options.build_mode == "modules":
+            # providers only, meant to be loaded by an OpenSSL of the same version
+            self.cpp_info.includedirs = []
+            self.cpp_info.libdirs = []
+            self.cpp_info.bindirs = []
+            return
+
         self.cpp_info.set_property("cmake_file_name", "OpenSSL")
         self.cpp_info.set_property("cmake_find_mode", "both")
         self.cpp_info.set_property("pkg_config_name", "openssl")
@@ -675,9 +743,3 @@ class OpenSSLConan(ConanFile):
         self.cpp_info.components["crypto"].names["cmake_find_package_multi"] = "Crypto"
         self.cpp_info.components["ssl"].names["cmake_find_package"] = "SSL"
         self.cpp_info.components["ssl"].names["cmake_find_package_multi"] = "SSL"
-
-        openssl_modules_dir = os.path.join(self.package_folder, "lib", "ossl-modules")
-        self.runenv_info.define_path("OPENSSL_MODULES", openssl_modules_dir)
-
-        # For legacy 1.x downstream consumers, remove once recipe is 2.0 only:
-        self.env_info.OPENSSL_MODULES = openssl_modules_dir
@@ -1,12 +1,13 @@
 import configparser
 import glob
+from concurrent.futures import ThreadPoolExecutor
 import os
 import platform
 import textwrap
 
 from conan import ConanFile, conan_version
 from conan.tools.apple import is_apple_os
-from conan.tools.build import cross_building, check_min_cppstd, default_cppstd
+from conan.tools.build import build_jobs, cross_building, check_min_cppstd, default_cppstd
 from conan.tools.cmake import CMake, CMakeDeps, CMakeToolchain, cmake_layout
 from conan.tools.env import VirtualBuildEnv, VirtualRunEnv, Environment
 from conan.tools.files import copy, get, replace_in_file, apply_conandata_patches, save, rm, rmdir, export_conandata_patches
@@ -17,6 +18,9 @@ from conan.errors import ConanException, ConanInvalidConfiguration
 
 required_conan_version = ">=1.55.0"
 
+# Parsed qtmodules<version>.conf, keyed by path: {"tree": {...}, "closure": {...}}
+_MODULE_TREE_CACHE = {}
+
 
 class QtConan(ConanFile):
     _submodules = ["qtsvg", "qtdeclarative", "qttools", "qttranslations", "qtdoc",
@@ -77,6 +81,8 @@ class QtConan(ConanFile):
         "sysroot": [None, "ANY"],
         "multiconfiguration": [True, False],
         "disabled_features": [None, "ANY"],
+        "parallel_module_builds": [None, "ANY"],
+        "module_build_jobs": [None, "ANY"],
     }
     options.update({module: [True, False] for module in _submodules})
     options.update({f"{status}_modules": [True, False] for status in _module_statuses})
@@ -122,6 +128,8 @@ class QtConan(ConanFile):
         "sysroot": None,
         "multiconfiguration": False,
         "disabled_features": "",
+        "parallel_module_builds": None,
+        "module_build_jobs": None,
     }
     # essential_modules, addon_modules, deprecated_modules, preview_modules:
     #    these are only provided for convenience, set to False by default
@@ -129,19 +137,31 @@ class QtConan(ConanFile):
 
     short_paths = True
 
-    _submodules_tree = None
-
     @property
     def _settings_build(self):
         return getattr(self, "settings_build", self.settings)
 
+    @property
+    def _module_tree_data(self):
+        conf_file = os.path.join(self.recipe_folder, f"qtmodules{self.version}.conf")
+        if conf_file not in _MODULE_TREE_CACHE:
+            tree = self._parse_module_tree(conf_file)
+            _MODULE_TREE_CACHE[conf_file] = {"tree": tree, "closure": self._module_tree_closure(tree)}
+        return _MODULE_TREE_CACHE[conf_file]
+
     @property
     def _get_module_tree(self):
-        if self._submodules_tree:
-            return self._submodules_tree
+        return self._module_tree_data["tree"]
+
+    @property
+    def _get_module_closure(self):
+        """Transitive dependencies of each module, in topological order (dependencies first)"""
+        return self._module_tree_data["closure"]
+
+    def _parse_module_tree(self, conf_file):
         config = configparser.ConfigParser()
-        config.read(os.path.join(self.recipe_folder, f"qtmodules{self.version}.conf"))
-        self._submodules_tree = {}
+        config.read(conf_file)
+        submodules_tree = {}
         assert config.sections(), f"no qtmodules.conf file for version {self.version}"
         for s in config.sections():
             section = str(s)
@@ -155,12 +175,35 @@ class QtConan(ConanFile):
                 if status not in self._module_statuses:
                     raise ConanException(f"module {modulename} has status {status} which is not in self._module_statuses {self._module_statuses}")
                 assert modulename in self._submodules, f"module {modulename} not in self._submodules"
-                self._submodules_tree[modulename] = {"status": status,
+                submodules_tree[modulename] = {"status": status,
                                 "path": str(config.get(section, "path")), "depends": []}
                 if config.has_option(section, "depends"):
-                    self._submodules_tree[modulename]["depends"] = [str(i) for i in config.get(section, "depends").split()]
-
-        return self._submodules_tree
+                    submodules_tree[modulename]["depends"] = [str(i) for i in config.get(section, "depends").split()]
+                if config.has_option(section, "recommends"):
+                    submodules_tree[modulename]["recommends"] = [str(i) for i in config.get(section, "recommends").split()]
+
+        return submodules_tree
+
+    @staticmethod
+    def _module_tree_closure(tree):
+        closure = {}
+
+        def visit(module, stack):
+            if module in closure:
+                return closure[module]
+            if module in stack:
+                raise ConanException(f"circular dependency between Qt modules: {' -> '.join(stack + [module])}")
+            deps = []
+            for dep in tree.get(module, {}).get("depends", []):
+                for transitive_dep in visit(dep, stack + [module]) + [dep]:
+                    if transitive_dep not in deps:
+                        deps.append(transitive_dep)
+            closure[module] = deps
+            return deps
+
+        for module in tree:
+            visit(module, [])
+        return closure
 
     def export_sources(self):
         export_conandata_patches(self)
@@ -218,6 +261,11 @@ class QtConan(ConanFile):
 
         if self.options.multiconfiguration:
             del self.settings.build_type
+            # per-module builds are driven with a single-config generator
+            self.options.rm_safe("parallel_module_builds")
+
+        if not self.options.get_safe("parallel_module_builds"):
+            self.options.rm_safe("module_build_jobs")
 
         # Requested modules:
         # - any module for non-removed options that have 'True' value
@@ -239,8 +287,7 @@ class QtConan(ConanFile):
 
         required_modules =  {}
         for module in requested_modules:
-            deps = self._get_module_tree[module]["depends"]
-            for dep in deps:
+            for dep in self._get_module_closure[module]:
                 required_modules.setdefault(dep,[]).append(module)
 
         required_but_disabled = [m for m in required_modules.keys() if self.options.get_safe(m) == False]
@@ -289,6 +336,11 @@ class QtConan(ConanFile):
                 self.info.settings.compiler == "clang" and Version(self.info.settings.compiler.version) >= "12":
                 raise ConanInvalidConfiguration("qt is not supported on gcc11 and clang >= 12 on C3I until conan-io/conan-center-index#13472 is fixed")
 
+        for option in ["parallel_module_builds", "module_build_jobs"]:
+            value = self.options.get_safe(option)
+            if value and (not str(value).isdigit() or int(str(value)) < 1):
+                raise ConanInvalidConfiguration(f"{self.ref} option {option} must be a positive integer")
+
         # C++ minimum standard required
         if self.settings.compiler.get_safe("cppstd"):
             check_min_cppstd(self, 17)
@@ -680,6 +732,9 @@ class QtConan(ConanFile):
     def package_id(self):
         del self.info.options.cross_compile
         del self.info.options.sysroot
+        # build strategy only, it doesn't change the binaries
+        self.info.options.rm_safe("parallel_module_builds")
+        self.info.options.rm_safe("module_build_jobs")
         if self.info.options.multiconfiguration:
             if self.info.settings.compiler == "Visual Studio":
                 if "MD" in self.info.settings.compiler.runtime:
@@ -831,10 +886,79 @@ class QtConan(ConanFile):
 
         return None
 
+    @property
+    def _module_build_plan(self):
+        """Enabled submodules grouped in waves: every module only depends on modules of previous waves.
+
+        Returns None when the whole super-repo is built at once."""
+        if not self.options.get_safe("parallel_module_builds"):
+            return None
+        enabled = [module for module in self._get_module_tree if self.options.get_safe(module)]
+        levels = {"qtbase": 0}
+
+        def level(module, stack):
+            if module not in levels:
+                # enabled optional dependencies ("recommends") must be built before too, otherwise
+                # the corresponding features would be silently disabled; skip them if they form a cycle
+                tree = self._get_module_tree[module]
+                deps = [dep for dep in tree["depends"] + tree.get("recommends", [])
+                        if (dep == "qtbase" or dep in enabled) and dep not in stack]
+                levels[module] = 1 + max([level(dep, stack + [module]) for dep in deps] or [0])
+            return levels[module]
+
+        for module in enabled:
+            level(module, [])
+        plan = [[] for _ in range(max(levels.values()) + 1)]
+        for module in ["qtbase"] + enabled:
+            plan[levels[module]].append(module)
+        return plan
+
+    def _module_build_folder(self, module):
+        return os.path.join(self.build_folder, "qt_modules", module)
+
+    @property
+    def _module_staging_folder(self):
+        return os.path.join(self.build_folder, "qt_staging")
+
+    def _configure_module(self, module):
+        staging_folder = self._module_staging_folder.replace("\\", "/")
+        cmake = CMake(self)
+        cmake.configure(build_script_folder=self._get_module_tree.get(module, {}).get("path", module),
+                        variables={
+                            "CMAKE_PREFIX_PATH": staging_folder,
+                            "QT_ADDITIONAL_PACKAGES_PREFIX_PATH": staging_folder,
+                        },
+                        cli_args=["-B", f'"{self._module_build_folder(module)}"'])
+
+    def _build_module(self, module, jobs):
+        build_folder = self._module_build_folder(module)
+        staging_folder = self._module_staging_folder.replace("\\", "/")
+        self.run(f'cmake --build "{build_folder}" --parallel {jobs}')
+        # later waves find this module in the staging folder, package() installs it again in the package folder
+        self.run(f'cmake --install "{build_folder}" --prefix "{staging_folder}"')
+
+    def _build_modules(self, plan):
+        concurrency = int(str(self.options.parallel_module_builds))
+        default_jobs = max(1, build_jobs(self) // concurrency)
+        jobs = int(str(self.options.get_safe("module_build_jobs") or default_jobs))
+        for wave in plan:
+            self.output.info(f"qt6: building {wave}")
+            # CMake.configure() changes the working directory of the whole process, so modules are configured
+            # one after the other; only the commands below, run with absolute paths, are executed concurrently
+            for module in wave:
+                self._configure_module(module)
+            with ThreadPoolExecutor(max_workers=min(concurrency, len(wave))) as executor:
+                for future in [executor.submit(self._build_module, module, jobs) for module in wave]:
+                    future.result()
+
     def build(self):
         if self.settings.os == "Macos":
             save(self, ".qmake.stash", "")
             save(self, ".qmake.super", "")
+        plan = self._module_build_plan
+        if plan:
+            self._build_modules(plan)
+            return
         cmake = CMake(self)
         cmake.configure()
         cmake.build()
@@ -854,8 +978,13 @@ class QtConan(ConanFile):
         if self.settings.os == "Macos":
             save(self, ".qmake.stash", "")
             save(self, ".qmake.super", "")
-        cmake = CMake(self)
-        cmake.install()
+        plan = self._module_build_plan
+        if plan:
+            for module in [module for wave in plan for module in wave]:
+                self.run(f'cmake --install "{self._module_build_folder(module)}" --prefix "{self.package_folder}"')
+        else:
+            cmake = CMake(self)
+            cmake.install()
         copy(self, "*LICENSE*", self.source_folder, os.path.join(self.package_folder, "licenses"),
              excludes="qtbase/examples/*")
         for module in self._get_module_tree: